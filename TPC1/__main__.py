@@ -0,0 +1,53 @@
+"""
+Command line entry point of the Query Visualizer.
+
+Usage (from the repository root):
+    $> python -m TPC1                                   # Interactive prompt.
+    $> python -m TPC1 dist age --file x.csv --interval 10
+    $> python -m TPC1 query age:10 sex has_desease --file x.csv
+"""
+
+import argparse
+import os
+
+from TPC1.main import BACKENDS, DEFAULT_DATASET, Interface, main
+from TPC1.render import Renderer
+
+
+def run_command() -> None:
+
+    arguments = argparse.ArgumentParser(prog="python -m TPC1", description="Query Visualizer 3000.")
+
+    arguments.add_argument("command", choices=["dist", "query"], help="Command to run, same as in the prompt.")
+    arguments.add_argument("args", nargs="+", help="Arguments of the command, same as in the prompt.")
+    arguments.add_argument("--file", default=DEFAULT_DATASET, help="csv file to load.")
+    arguments.add_argument("--interval", type=int, help="Interval size of 'dist'.")
+    arguments.add_argument("--backend", choices=BACKENDS, default="columnar",
+                           help="Storage backend, the same default as the prompt.")
+    arguments.add_argument("--workers", type=int, default=1, help="Processes used to load the file.")
+    arguments.add_argument("--plot", choices=Renderer.FORMATS, help="Also write a plot of 'dist' in this format.")
+
+    args = arguments.parse_args()
+
+    if not os.path.isfile(args.file):
+        arguments.error(f"argument --file: {args.file} is not an existing file.")
+
+    ui = Interface(args.file, args.backend, args.workers, follow=False)
+
+    if args.plot:
+        ui.handle_plot(["plot", args.plot])
+
+    user_input: list[str] = [args.command, *args.args]
+
+    if args.interval is not None:
+        user_input.append(str(args.interval))
+
+    ui.handle_input(user_input)
+    ui.renderer.wait()
+
+
+if __name__ == '__main__':
+
+    import sys
+
+    SystemExit(main() if len(sys.argv) == 1 else run_command())
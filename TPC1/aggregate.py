@@ -0,0 +1,143 @@
+from collections import Counter
+
+from TPC1.models import Entry
+from TPC1.query import GroupKey
+from TPC1.storage import Storage
+
+
+class AggregateStorage(Storage):
+    """
+    Storage that only keeps counters of the csv file, not the entries themselves.
+
+    For every numeric attribute it counts how many entries share the same (value, sex, has_desease), which is
+    everything the distributions need. Memory depends on the number of distinct values and not on the number
+    of entries, so files larger than the available memory can be queried when loaded in chunks.
+    """
+
+    def __init__(self):
+        """
+        Class constructor.
+        """
+
+        super().__init__()
+
+        self.genders: Counter = Counter()
+        self.counts: dict[str, Counter] = {param: Counter() for param in self.PARAMS}
+
+    def __len__(self) -> int:
+        return self.total_entries
+
+    def add(self, entry: Entry) -> None:
+        """
+        Count an entry into the storage.
+        :param entry: Entry of type Entry to add.
+        :return: None
+        """
+
+        sick: int = int(entry.has_desease)
+
+        self.invalidate()
+        self.total_entries += 1
+        self.genders[(entry.sex, sick)] += 1
+
+        for param in self.PARAMS:
+            self.counts[param][(getattr(entry, param), entry.sex, sick)] += 1
+
+    def add_batch(self, rows: list[list[str]]) -> None:
+        """
+        Count a batch of already split csv lines into the storage.
+        :param rows: List of csv lines, each one as a list of strings.
+        :return: None
+        """
+
+        if not rows:
+            return
+
+        ages, sexes, tensions, cholestrols, bpms, sicks = zip(*rows)
+
+        sexes: list[str] = [sex.strip() for sex in sexes]
+        sicks: list[int] = list(map(int, sicks))
+
+        self.invalidate()
+        self.total_entries += len(sicks)
+        self.genders.update(zip(sexes, sicks))
+
+        for param, values in zip(self.PARAMS, (ages, tensions, cholestrols, bpms)):
+            self.counts[param].update(zip(map(int, values), sexes, sicks))
+
+    def merge(self, other: 'AggregateStorage') -> None:
+        """
+        Add the counters of another storage, used to join storages loaded in parallel.
+        :param other: Storage to merge into this one.
+        :return: None
+        """
+
+        self.invalidate()
+        self.total_entries += other.total_entries
+        self.rejected_entries += other.rejected_entries
+        self.genders.update(other.genders)
+
+        for param in self.PARAMS:
+            self.counts[param].update(other.counts[param])
+
+    def finish(self) -> None:
+        """
+        Build the indexes, the counters themselves are always up to date.
+        :return: None
+        """
+
+        self.build_indexes()
+
+    def count_groups(self, keys: list[GroupKey]) -> dict[tuple, int]:
+        """
+        Count the entries of every group, from the counters of at most one numeric attribute.
+        :param keys: The (attribute, interval) pairs to group by.
+        :return: Dictionary with the amount of entries of every group.
+        """
+
+        numeric: list[str] = [name for name, _ in keys if name in self.PARAMS]
+
+        if len(numeric) > 1:
+            raise ValueError("The counters backend can only group by one of age, tension, cholestrol or bpm at once.")
+
+        if numeric:
+            counts: dict = self.counts[numeric[0]]
+        else:
+            counts: dict = {(None, sex, sick): amount for (sex, sick), amount in self.genders.items()}
+
+        groups: Counter = Counter()
+
+        for (value, sex, sick), amount in counts.items():
+
+            attributes: dict = {"sex": sex, "has_desease": bool(sick)}
+
+            if numeric:
+                attributes[numeric[0]] = value
+
+            groups[tuple(
+                attributes[name] // width * width if width else attributes[name] for name, width in keys
+            )] += amount
+
+        return groups
+
+    def count_genders(self) -> tuple[int, int, int, int]:
+        """
+        Count the entries by gender and desease status.
+        :return: Tuple with the amount of sick males, sick females, healthy males and healthy females.
+        """
+
+        return self.genders[("M", 1)], self.genders[("F", 1)], self.genders[("M", 0)], self.genders[("F", 0)]
+
+    def count_values(self, param: str) -> dict[tuple[int, int], int]:
+        """
+        Count the entries that share the same value of an attribute and desease status.
+        :param param: Name of the attribute.
+        :return: Dictionary with the amount of entries for every (value, has_desease) pair.
+        """
+
+        counts: Counter = Counter()
+
+        for (value, _, sick), amount in self.counts[param].items():
+            counts[(value, sick)] += amount
+
+        return counts
@@ -0,0 +1,294 @@
+"""
+Benchmarks for the Query Visualizer.
+
+Usage (from the repository root):
+    $> python -m TPC1.bench suite --sizes 1e3 1e5 1e7 --output bench.json
+    $> python -m TPC1.bench compare old-bench.json bench.json
+    $> python -m TPC1.bench parallel --rows 2000000 --workers 1 2 4 8
+    $> python -m TPC1.bench startup --runs 10
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from TPC1 import parser
+from TPC1.columnar import load_numpy
+from TPC1.main import BACKENDS, validator
+from TPC1.query import parse_group_keys
+from TPC1.synthetic import generate
+
+
+def bench_parallel(file_path: str, backend: str, workers: list[int]) -> None:
+    """
+    Times 'parser.read_csv_parallel' with different amounts of workers and prints the speedup over one worker.
+
+    :param file_path: csv file to load.
+    :param backend: Storage backend to build.
+    :param workers: Amounts of workers to try.
+    :return: None
+    """
+
+    baseline: float = 0
+
+    print(f"{'workers':>8} | {'seconds':>8} | {'speedup':>8}")
+
+    for amount in workers:
+
+        start: float = time.perf_counter()
+        parser.read_csv_parallel(file_path, validator, BACKENDS[backend], amount)
+        elapsed: float = time.perf_counter() - start
+
+        baseline = baseline or elapsed
+
+        print(f"{amount:>8} | {elapsed:>8.3f} | {baseline / elapsed:>7.2f}x")
+
+    print(f"(Machine has {os.cpu_count()} CPUs.)")
+
+
+def peak_rss() -> int:
+    """
+    :return: Peak resident memory of this process so far, in bytes.
+    """
+
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_stages(file_path: str, backend: str) -> list[dict]:
+    """
+    Loads a file and runs every query on it, measuring each stage.
+    Meant to run in a fresh process (see 'bench_suite'), as the peak memory of a process never goes down.
+
+    :param file_path: csv file to load.
+    :param backend: Storage backend to build.
+    :return: List with the name, seconds, rows per second and peak memory after each stage.
+    """
+
+    results: list[dict] = []
+    storage = None
+
+    def parse():
+        nonlocal storage
+        storage = parser.read_part(file_path, validator, BACKENDS[backend])
+
+    stages: dict = {
+        "parse": parse,
+        "finish": lambda: storage.finish(),
+        "dist_gender": lambda: storage.dist_sick_by_gender(),
+        "dist_age": lambda: storage.dist_sick_by_param_interval(5, "age"),
+        "dist_cholestrol": lambda: storage.dist_sick_by_param_interval(5, "cholestrol"),
+        "group_by": lambda: storage.group_by(parse_group_keys(["age:10", "sex", "has_desease"]))
+    }
+
+    for name, stage in stages.items():
+
+        start: float = time.perf_counter()
+        stage()
+        elapsed: float = time.perf_counter() - start
+
+        results.append({
+            "stage": name,
+            "seconds": elapsed,
+            "rows_per_second": len(storage) / elapsed if elapsed else None,
+            "peak_rss": peak_rss()
+        })
+
+    return results
+
+
+def bench_suite(sizes: list[int], backends: list[str], seed: int, output: str) -> dict:
+    """
+    Runs every stage for every size and backend, each combination in its own process, and saves the results.
+
+    :param sizes: Amounts of entries of the synthetic files.
+    :param backends: Storage backends to measure.
+    :param seed: Seed of the synthetic files.
+    :param output: Where to write the results as JSON.
+    :return: The results.
+    """
+
+    package: str = os.path.dirname(os.path.abspath(__file__))
+
+    commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=package)
+    numpy = load_numpy()
+
+    report: dict = {
+        "commit": commit.stdout.strip() or None,
+        "python": platform.python_version(),
+        "numpy": numpy.__version__ if numpy else None,
+        "cpus": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": []
+    }
+
+    print(f"{'rows':>10} | {'backend':>8} | {'stage':>15} | {'seconds':>8} | {'rows/s':>12} | {'peak MiB':>8}")
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        for size in sizes:
+
+            file_path: str = os.path.join(directory, f"synthetic-{size}.csv")
+            generate(file_path, size, seed)
+
+            for backend in backends:
+
+                child = subprocess.run(
+                    [sys.executable, "-m", "TPC1.bench", "stages", file_path, backend],
+                    check=True, capture_output=True, text=True, cwd=os.path.dirname(package)
+                )
+
+                for stage in json.loads(child.stdout):
+
+                    report["runs"].append({"rows": size, "backend": backend, **stage})
+
+                    print(f"{size:>10} | {backend:>8} | {stage['stage']:>15} | {stage['seconds']:>8.3f} | "
+                          f"{stage['rows_per_second'] or 0:>12.0f} | {stage['peak_rss'] / (1 << 20):>8.1f}")
+
+            os.remove(file_path)
+
+    with open(output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+
+    print(f"(Results saved to {output}.)")
+
+    return report
+
+
+def bench_compare(old: str, new: str) -> None:
+    """
+    Prints the change of time and peak memory of every stage between two results of 'bench_suite'.
+
+    :param old: JSON file with the reference results.
+    :param new: JSON file with the new results.
+    :return: None
+    """
+
+    reports: list[dict] = []
+
+    for file_path in [old, new]:
+        with open(file_path, "r") as report_file:
+            reports.append(json.load(report_file))
+
+    reference: dict = {(run["rows"], run["backend"], run["stage"]): run for run in reports[0]["runs"]}
+
+    print(f"{str(reports[0]['commit'])[:8]} -> {str(reports[1]['commit'])[:8]}")
+    print(f"{'rows':>10} | {'backend':>8} | {'stage':>15} | {'time':>8} | {'memory':>8}")
+
+    for run in reports[1]["runs"]:
+
+        if (before := reference.get((run["rows"], run["backend"], run["stage"]))) is None:
+            continue
+
+        time_ratio: float = run["seconds"] / before["seconds"] if before["seconds"] else float("nan")
+        memory_ratio: float = run["peak_rss"] / before["peak_rss"]
+
+        print(f"{run['rows']:>10} | {run['backend']:>8} | {run['stage']:>15} | "
+              f"{time_ratio:>7.2f}x | {memory_ratio:>7.2f}x")
+
+
+def bench_startup(runs: int) -> None:
+    """
+    Times, in fresh interpreters, importing the Query Visualizer and running a single 'dist' from the command line,
+    and checks that neither pulls in NumPy nor matplotlib.
+
+    :param runs: Amount of times each command is timed, the median is reported.
+    :return: None
+    """
+
+    package: str = os.path.dirname(os.path.abspath(__file__))
+    dataset: str = os.path.join(package, "datasets", "myheart.csv")
+
+    commands: dict[str, list[str]] = {
+        "import TPC1.main": [sys.executable, "-c", "import TPC1.main"],
+        "dist age (counters)": [sys.executable, "-m", "TPC1", "dist", "age", "--file", dataset],
+        "heavy modules": [
+            sys.executable, "-c",
+            "import sys, TPC1.main; print(sorted({'numpy', 'matplotlib'} & set(sys.modules)) or 'none', end='')"
+        ]
+    }
+
+    print(f"{'command':>20} | {'median ms':>9} | {'min ms':>9}")
+
+    for name, command in commands.items():
+
+        timings: list[float] = []
+
+        for _ in range(runs):
+
+            start: float = time.perf_counter()
+            output = subprocess.run(
+                command, check=True, capture_output=True, text=True, cwd=os.path.dirname(package)
+            ).stdout
+            timings.append((time.perf_counter() - start) * 1000)
+
+        print(f"{name:>20} | {statistics.median(timings):>9.1f} | {min(timings):>9.1f}")
+
+    print(f"(Heavy modules imported by 'import TPC1.main': {output}.)")
+
+
+def main():
+
+    arguments = argparse.ArgumentParser(description="Query Visualizer benchmarks.")
+    commands = arguments.add_subparsers(dest="command", required=True)
+
+    parallel = commands.add_parser("parallel", help="Speedup of the parallel loader.")
+    parallel.add_argument("--file", help="csv file to load, a synthetic one is generated by default.")
+    parallel.add_argument("--rows", type=lambda value: int(float(value)), default=2_000_000, help="Size of the synthetic file.")
+    parallel.add_argument("--backend", choices=BACKENDS, default="counters")
+    parallel.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+
+    startup = commands.add_parser("startup", help="Start-up time of the Query Visualizer.")
+    startup.add_argument("--runs", type=int, default=10)
+
+    suite = commands.add_parser("suite", help="Time and memory of every stage, per size and backend.")
+    suite.add_argument("--sizes", type=lambda value: int(float(value)), nargs="+", default=[1000, 100_000])
+    suite.add_argument("--backends", choices=BACKENDS, nargs="+", default=list(BACKENDS))
+    suite.add_argument("--seed", type=int, default=0)
+    suite.add_argument("--output", default="bench.json")
+
+    compare = commands.add_parser("compare", help="Compare two results of 'suite'.")
+    compare.add_argument("old")
+    compare.add_argument("new")
+
+    stages = commands.add_parser("stages", help="Used by 'suite', runs every stage once and prints JSON.")
+    stages.add_argument("file")
+    stages.add_argument("backend", choices=BACKENDS)
+
+    args = arguments.parse_args()
+
+    if args.command == "suite":
+        bench_suite(args.sizes, args.backends, args.seed, args.output)
+
+    if args.command == "compare":
+        bench_compare(args.old, args.new)
+
+    if args.command == "stages":
+        print(json.dumps(run_stages(args.file, args.backend)))
+
+    if args.command == "startup":
+        bench_startup(args.runs)
+
+    if args.command == "parallel":
+
+        if args.file:
+            bench_parallel(args.file, args.backend, args.workers)
+            return
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            file_path: str = os.path.join(directory, "synthetic.csv")
+            generate(file_path, args.rows)
+
+            bench_parallel(file_path, args.backend, args.workers)
+
+
+if __name__ == '__main__':
+    SystemExit(main())
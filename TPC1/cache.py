@@ -0,0 +1,165 @@
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import sys
+
+from array import array
+from typing import Optional
+
+from TPC1.columnar import ColumnarStorage
+
+# Default location of the cache.
+CACHE_DIRECTORY: str = os.path.join(os.path.expanduser("~"), ".cache", "query-visualizer")
+
+# Bumped whenever the layout of the cached files changes.
+CACHE_VERSION: int = 2
+
+
+class DatasetCache:
+    """
+    Persistent cache of the columns parsed from csv files.
+
+    Every cached file gets a directory, named after the hash of its path, with a 'meta.json' describing it and one
+    raw binary file per column (the bytes of the `array.array`). Cached columns are memory-mapped when loaded, so
+    opening a cached data set does not copy nor parse anything.
+    An entry is only used if the path, modification time and size of the csv file are the same as when it was cached.
+    """
+
+    def __init__(self, directory: str = CACHE_DIRECTORY):
+        """
+        Class constructor.
+        :param directory: Where to keep the cached data sets.
+        """
+
+        self.directory = directory
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.writes: int = 0
+
+    def __entry_path__(self, file_path: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest())
+
+    @staticmethod
+    def __signature__(file_path: str) -> dict:
+        status = os.stat(file_path)
+
+        return {
+            "version": CACHE_VERSION,
+            "path": os.path.abspath(file_path),
+            "mtime": status.st_mtime_ns,
+            "size": status.st_size,
+            "byteorder": sys.byteorder
+        }
+
+    def load(self, file_path: str) -> Optional[ColumnarStorage]:
+        """
+        Open the cached columns of a csv file.
+        :param file_path: Path to the csv file.
+        :return: The storage with memory-mapped columns, or None if there is no valid cache entry.
+        """
+
+        entry_path: str = self.__entry_path__(file_path)
+
+        try:
+            with open(os.path.join(entry_path, "meta.json"), "r") as meta_file:
+                meta: dict = json.load(meta_file)
+
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if meta["signature"] != self.__signature__(file_path):
+            self.invalidate(file_path)
+            self.misses += 1
+            return None
+
+        columns: dict = {}
+
+        for name, typecode in meta["columns"].items():
+
+            with open(os.path.join(entry_path, f"{name}.bin"), "rb") as column_file:
+
+                if meta["rows"] == 0:
+                    columns[name] = array(typecode)
+                    continue
+
+                mapped = mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ)
+                columns[name] = memoryview(mapped).cast(typecode)
+
+        self.hits += 1
+
+        storage: ColumnarStorage = ColumnarStorage.from_columns(columns)
+        storage.rejected_entries = meta["rejected"]
+
+        return storage
+
+    def save(self, file_path: str, storage: ColumnarStorage) -> None:
+        """
+        Write the columns of a loaded csv file into the cache.
+        :param file_path: Path to the csv file the storage was loaded from.
+        :param storage: Storage holding the columns.
+        :return: None
+        """
+
+        entry_path: str = self.__entry_path__(file_path)
+        temporary_path: str = entry_path + ".tmp"
+
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        os.makedirs(temporary_path)
+
+        for name, column in storage.columns.items():
+            with open(os.path.join(temporary_path, f"{name}.bin"), "wb") as column_file:
+                column_file.write(column)
+
+        with open(os.path.join(temporary_path, "meta.json"), "w") as meta_file:
+            json.dump({
+                "signature": self.__signature__(file_path),
+                "rows": len(storage),
+                "rejected": storage.rejected_entries,
+                "columns": storage.COLUMNS
+            }, meta_file)
+
+        shutil.rmtree(entry_path, ignore_errors=True)
+        os.replace(temporary_path, entry_path)
+
+        self.writes += 1
+
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """
+        Remove the cache entry of a csv file, or every entry.
+        :param file_path: Path to the csv file, if None the whole cache is cleared.
+        :return: None
+        """
+
+        if file_path is None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+        else:
+            shutil.rmtree(self.__entry_path__(file_path), ignore_errors=True)
+
+    def stats(self) -> dict:
+        """
+        :return: Dictionary with the hit, miss and write counters and the amount of data on disk.
+        """
+
+        entries: int = 0
+        size: int = 0
+
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+
+                if not entry.is_dir() or entry.name.endswith(".tmp"):
+                    continue
+
+                entries += 1
+                size += sum(column.stat().st_size for column in os.scandir(entry.path))
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "entries": entries,
+            "bytes": size
+        }
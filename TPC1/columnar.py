@@ -0,0 +1,254 @@
+from array import array
+from collections import Counter
+from functools import cache
+
+from TPC1.models import Entry
+from TPC1.query import GroupKey
+from TPC1.storage import Storage
+
+
+@cache
+def load_numpy():
+    """
+    Import NumPy on first use, so that loading the module (or using other backends) does not pay for it.
+    :return: The numpy module, or None if it is not installed.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    return numpy
+
+
+class ColumnarStorage(Storage):
+    """
+    Storage that keeps every attribute of the csv file in its own typed column.
+
+    Rows are appended to `array.array` columns while loading, once `finish()` is called the columns
+    are exposed as NumPy arrays (without copying) so that the queries can run as vectorized operations.
+    When NumPy is not installed the queries fall back to iterating over the arrays.
+    """
+
+    # Column name -> array typecode.
+    COLUMNS: dict[str, str] = {
+        "age": "h",
+        "sex": "B",
+        "tension": "h",
+        "cholestrol": "h",
+        "bpm": "h",
+        "has_desease": "B"
+    }
+
+    # Encoding of the 'sex' column.
+    SEXES: tuple[str, str] = ("M", "F")
+
+    def __init__(self):
+        """
+        Class constructor.
+        """
+
+        super().__init__()
+
+        self.columns: dict[str, array] = {name: array(code) for name, code in self.COLUMNS.items()}
+        self.vectors: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.columns["age"])
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> 'ColumnarStorage':
+        """
+        Builds a storage on top of existing columns without copying them.
+        The columns can be read-only buffers (such as memory-mapped files), they are copied if entries are added.
+
+        :param columns: Dictionary with a buffer of the right typecode for every column.
+        :return: The finished storage.
+        """
+
+        storage = cls()
+        storage.columns = dict(columns)
+        storage.finish()
+
+        return storage
+
+    def __make_writable__(self) -> None:
+        """
+        Drop the NumPy views, which lock the size of the underlying arrays, and copy read-only columns into arrays.
+        :return: None
+        """
+
+        self.vectors = {}
+        self.invalidate()
+
+        for name, column in self.columns.items():
+            if not isinstance(column, array):
+                self.columns[name] = array(self.COLUMNS[name], column.tobytes())
+
+    def add(self, entry: Entry) -> None:
+        """
+        Insert an entry into the storage.
+        :param entry: Entry of type Entry to add.
+        :return: None
+        """
+
+        self.__make_writable__()
+
+        self.columns["age"].append(entry.age)
+        self.columns["sex"].append(self.SEXES.index(entry.sex))
+        self.columns["tension"].append(entry.tension)
+        self.columns["cholestrol"].append(entry.cholestrol)
+        self.columns["bpm"].append(entry.bpm)
+        self.columns["has_desease"].append(entry.has_desease)
+
+    def add_batch(self, rows: list[list[str]]) -> None:
+        """
+        Insert a batch of already split csv lines into the storage, one column at a time.
+        :param rows: List of csv lines, each one as a list of strings.
+        :return: None
+        """
+
+        if not rows:
+            return
+
+        self.__make_writable__()
+
+        ages, sexes, tensions, cholestrols, bpms, sicks = zip(*rows)
+
+        self.columns["age"].extend(map(int, ages))
+        self.columns["sex"].extend(map(self.SEXES.index, sexes))
+        self.columns["tension"].extend(map(int, tensions))
+        self.columns["cholestrol"].extend(map(int, cholestrols))
+        self.columns["bpm"].extend(map(int, bpms))
+        self.columns["has_desease"].extend(map(int, sicks))
+
+    def merge(self, other: 'ColumnarStorage') -> None:
+        """
+        Append the columns of another storage, used to join storages loaded in parallel.
+        :param other: Storage to merge into this one.
+        :return: None
+        """
+
+        self.__make_writable__()
+        self.rejected_entries += other.rejected_entries
+
+        for name, column in self.columns.items():
+            column.extend(other.columns[name])
+
+    def finish(self) -> None:
+        """
+        Expose the columns as NumPy arrays and build the indexes, no sorting is needed.
+        :return: None
+        """
+
+        self.expose_vectors()
+        self.build_indexes()
+
+    def expose_vectors(self) -> None:
+        """
+        Expose the columns as NumPy arrays (without copying), the indexes are left as they are.
+        :return: None
+        """
+
+        np = load_numpy()
+
+        if np is not None:
+            self.vectors = {
+                name: np.frombuffer(column, dtype=self.COLUMNS[name]) for name, column in self.columns.items()
+            }
+
+    def column(self, name: str):
+        """
+        Retrieve a column, as a NumPy array if available.
+        :param name: Name of the column (an attribute of Entry).
+        :return: The column values.
+        """
+
+        np = load_numpy()
+
+        # After 'extend' only the views are gone, the indexes were updated with the batch.
+        if np is not None and not self.vectors:
+            self.expose_vectors()
+
+        return self.vectors.get(name, self.columns[name])
+
+    def count_genders(self) -> tuple[int, int, int, int]:
+        """
+        Count the entries by gender and desease status.
+        :return: Tuple with the amount of sick males, sick females, healthy males and healthy females.
+        """
+
+        np = load_numpy()
+
+        sex = self.column("sex")
+        sick = self.column("has_desease")
+
+        # Index is 'sex * 2 + has_desease': 0 healthy males, 1 sick males, 2 healthy females, 3 sick females.
+        if np is not None:
+            counts: list[int] = np.bincount(sex * 2 + sick, minlength=4).tolist()
+        else:
+            counter: Counter = Counter(zip(sex, sick))
+            counts: list[int] = [counter[(s, d)] for s in (0, 1) for d in (0, 1)]
+
+        healthy_males, sick_males, healthy_females, sick_females = counts
+
+        return sick_males, sick_females, healthy_males, healthy_females
+
+    def count_values(self, param: str) -> dict[tuple[int, int], int]:
+        """
+        Count the entries that share the same value of an attribute and desease status.
+        :param param: Name of the attribute.
+        :return: Dictionary with the amount of entries for every (value, has_desease) pair.
+        """
+
+        np = load_numpy()
+
+        values = self.column(param)
+        sick = self.column("has_desease")
+
+        if np is None:
+            return Counter(zip(values, sick))
+
+        # Pack both columns into a single key, 'value * 2 + has_desease', and count the distinct keys.
+        keys, amounts = np.unique(values.astype(np.int64) * 2 + sick, return_counts=True)
+
+        return {(key >> 1, key & 1): amount for key, amount in zip(keys.tolist(), amounts.tolist())}
+
+    def count_groups(self, keys: list[GroupKey]) -> dict[tuple, int]:
+        """
+        Count the entries of every group, in a single vectorized pass over the needed columns.
+        :param keys: The (attribute, interval) pairs to group by.
+        :return: Dictionary with the amount of entries of every group.
+        """
+
+        np = load_numpy()
+
+        columns: list = [self.column(name) for name, _ in keys]
+
+        if np is None:
+            groups = zip(*[
+                map(lambda value, w=width: value // w * w, column) if width else column
+                for column, (_, width) in zip(columns, keys)
+            ])
+            counts: dict = Counter(groups)
+
+        else:
+            stacked = np.stack([
+                column.astype(np.int64) // width * width if width else column.astype(np.int64)
+                for column, (_, width) in zip(columns, keys)
+            ])
+
+            groups, amounts = np.unique(stacked, axis=1, return_counts=True)
+            counts: dict = dict(zip(map(tuple, groups.T.tolist()), amounts.tolist()))
+
+        # Decode the columns that are not stored as they are in an Entry.
+        decoders: list = [
+            self.SEXES.__getitem__ if name == "sex" else bool if name == "has_desease" else int
+            for name, _ in keys
+        ]
+
+        return {
+            tuple(decode(value) for decode, value in zip(decoders, group)): amount
+            for group, amount in counts.items()
+        }
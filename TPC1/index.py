@@ -0,0 +1,86 @@
+from bisect import bisect_left
+from itertools import accumulate
+
+
+class PrefixIndex:
+    """
+    Cumulative amount of sick and healthy entries over the sorted distinct values of an attribute.
+
+    The amount of entries with a value inside any [lo, hi[ range is the difference of two prefix sums, so
+    histograms with any interval size are computed without looking at the entries again.
+    """
+
+    def __init__(self, counts: dict[tuple[int, int], int]):
+        """
+        Class constructor.
+        :param counts: Amount of entries for every (value, has_desease) pair.
+        """
+
+        # Value -> [healthy, sick] amount of entries.
+        self.amounts: dict[int, list[int]] = {}
+
+        self.update(counts)
+
+    def update(self, counts: dict[tuple[int, int], int]) -> None:
+        """
+        Add more entries to the index, only the prefix sums are recomputed (one step per distinct value).
+        :param counts: Amount of new entries for every (value, has_desease) pair.
+        :return: None
+        """
+
+        for (value, sick), amount in counts.items():
+            self.amounts.setdefault(int(value), [0, 0])[int(sick)] += amount
+
+        self.values: list[int] = sorted(self.amounts)
+
+        # prefix[i] is the amount of entries with a value smaller than values[i].
+        self.healthy: list[int] = [0, *accumulate(self.amounts[value][0] for value in self.values)]
+        self.sick: list[int] = [0, *accumulate(self.amounts[value][1] for value in self.values)]
+
+    def count(self, lo: int, hi: int, start: int = 0) -> tuple[int, int]:
+        """
+        Amount of sick and healthy entries with a value in [lo, hi[.
+
+        :param lo: Lower bound, inclusive.
+        :param hi: Upper bound, exclusive.
+        :param start: Position of the values list from where to start searching.
+        :return: Tuple with the amount of sick and healthy entries.
+        """
+
+        first: int = bisect_left(self.values, lo, start)
+        last: int = bisect_left(self.values, hi, first)
+
+        return self.sick[last] - self.sick[first], self.healthy[last] - self.healthy[first]
+
+    def histogram(self, interval: int) -> tuple[dict, dict]:
+        """
+        Amount of sick and healthy entries per interval, from 0 up to the interval of the greatest value.
+
+        :param interval: The interval size.
+        :return: Tuple with the sick and healthy dictionaries, indexed by the formatted interval.
+        """
+
+        sick: dict = {}
+        healthy: dict = {}
+
+        if not self.values:
+            return sick, healthy
+
+        position: int = 0
+
+        for lo in range(0, (self.values[-1] // interval) * interval + interval, interval):
+
+            interval_fmt: str = f"[{lo}-{lo + interval}["
+            sick[interval_fmt], healthy[interval_fmt] = self.count(lo, lo + interval, position)
+
+            position = bisect_left(self.values, lo + interval, position)
+
+        return sick, healthy
+
+    @property
+    def total_sick(self) -> int:
+        return self.sick[-1]
+
+    @property
+    def total_healthy(self) -> int:
+        return self.healthy[-1]
@@ -1,11 +1,29 @@
 import os
+import time
+from dataclasses import replace
 from typing import Callable
 
-import parser
+from TPC1 import parser
 
 from TPC1.storage import Storage
+from TPC1.columnar import ColumnarStorage
+from TPC1.aggregate import AggregateStorage
+from TPC1.cache import DatasetCache
+from TPC1.schema import HEART_SCHEMA
 
-from TPC1.tables import tabulate_interval, tabulate_gender
+from TPC1.render import Renderer
+from TPC1.query import FIELDS, parse_group_keys, format_group
+from TPC1.tables import tabulate_interval, tabulate_gender, tabulate_groups
+
+
+# Data set loaded when none is given, found from where the package is, not from where it is run.
+DEFAULT_DATASET: str = os.path.join(os.path.dirname(__file__), "datasets", "myheart.csv")
+
+BACKENDS: dict[str, type] = {
+    "rows": Storage,
+    "columnar": ColumnarStorage,
+    "counters": AggregateStorage
+}
 
 
 def validator(entry: list[str]) -> bool:
@@ -14,57 +32,186 @@ def validator(entry: list[str]) -> bool:
 
 class Interface:
 
-    def __init__(self, inital_path: str):
+    def __init__(self, inital_path: str, backend: str = "columnar", workers: int = 1, follow: bool = True):
 
         self.path = inital_path
+        self.backend = backend
+        self.workers = workers
+        self.cache = DatasetCache()
+
+        # Whether data sets may be followed with 'watch', a line still being written is then left for it.
+        self.follow = follow
+
+        # Byte offset up to where the current data set was read, used to follow appended entries.
+        self.offset: int = 0
 
-        self.storage: Storage = parser.read_csv(self.path, validator)
+        self.storage: Storage = self.read(self.path)
 
         self.plot: bool = False
         self.tables: bool = True
 
+        self.renderer = Renderer()
+
         self.commands: dict = {
 
             "help": self.handle_help,
             "plot": self.handle_plot,
             "tables": self.handle_tables,
             "load": self.handle_load,
-            "dist": self.handle_dist
+            "dist": self.handle_dist,
+            "backend": self.handle_backend,
+            "workers": self.handle_workers,
+            "cache": self.handle_cache,
+            "stats": self.handle_stats,
+            "watch": self.handle_watch,
+            "query": self.handle_query
+
+        }
 
+        # Maximum amount of words of each command, when different from two.
+        self.arguments: dict[str, int] = {
+            "dist": 3,
+            "watch": 3,
+            "query": 1 + len(FIELDS)
         }
 
+    def read(self, path: str) -> Storage:
+
+        # Malformed lines are rejected by the schema and written next to the data set.
+        self.schema = replace(HEART_SCHEMA, reject_path=path + ".rejected")
+
+        # A last line without its new line may still be being written, it is read by 'watch' once it is complete.
+        end: int = parser.complete_end(path) if self.follow else os.path.getsize(path)
+        complete: bool = end == os.path.getsize(path)
+
+        # Only the columnar backend can be cached, the other ones don't keep plain columns.
+        if self.backend != "columnar" or not complete or (storage := self.cache.load(path)) is None:
+
+            if os.path.isfile(self.schema.reject_path):
+                os.remove(self.schema.reject_path)
+
+            storage: Storage = parser.read_csv_parallel(
+                path, validator, BACKENDS[self.backend], self.workers, schema=self.schema, end=end
+            )
+
+            if self.backend == "columnar" and complete:
+                self.cache.save(path, storage)
+
+        if storage.rejected_entries:
+            print(f"system> {storage.rejected_entries} malformed entries were ignored, "
+                  f"they are listed in {self.schema.reject_path}.")
+
+        self.offset = end
+
+        return storage
+
     @staticmethod
     def handle_help(_) -> None:
 
         print("system> Available commands:")
         print("        help - Displays this message on the screen.")
-        print("        plot {on|off} - Enables or disables the display of plots for the distributions.")
+        print("        plot {on|off|png|svg} - Enables or disables writing plots of the distributions to files "
+              "(on the background), png or svg also choose the format.")
         print("        tables {on|off} - Enables or disables the display of tables for the distributions.")
         print("        load {file-path} - Change the current data set to the indicated by 'file-path'.")
-        print("        dist {gender|age|cholestrol} - Computes the distribution for the indicated query.")
+        print("        dist {gender|age|tension|cholestrol|bpm} [interval] - Computes the distribution for the indicated "
+              "query.")
+        print("        query {attribute[:interval]}... - Counts the entries of every combination of the "
+              "attributes, e.g. 'query age:10 sex has_desease'.")
+        print("        backend {rows|columnar|counters} - Change how the data set is stored in memory "
+              "(reloads the data set).")
+        print("        workers {amount} - Number of processes used to load data sets.")
+        print("        cache {stats|clear} - Shows the data set cache statistics or empties the cache.")
+        print("        stats - Shows the query result cache statistics.")
+        print("        watch {gender|age|tension|cholestrol|bpm} [seconds] - Follows new entries of the data set, "
+              "showing the distribution every few seconds (Ctrl+C to stop).")
 
     def handle_dist(self, user_input: list[str]):
 
         query: str = user_input[1]
 
-        if query not in ["gender", "age", "cholestrol"]:
+        if query not in ["gender", *Storage.PARAMS]:
             print(f"dist.error> Invalid argument {query}.")
             return
 
+        interval: int = 5
+
+        if len(user_input) > 2:
+
+            if query == "gender" or not user_input[2].isdigit() or int(user_input[2]) < 1:
+                print(f"dist.error> Invalid interval {user_input[2]}.")
+                return
+
+            interval = int(user_input[2])
+
         if query == "gender":
-            result: dict = self.storage.dist_sick_by_gender(display=self.plot)
+            result: dict = self.storage.dist_sick_by_gender()
+
+            if self.plot:
+                print(f"system> Plot will be written to {self.renderer.render_gender(result)}.")
 
             if self.tables:
                 tabulate_gender(result, "Desease distribution by gender.")
 
             return
 
-        if query in ["age", "cholestrol"]:
-            result: dict = self.storage.dist_sick_by_param_interval(param=query, display=self.plot)
+        result: dict = self.storage.dist_sick_by_param_interval(interval, param=query)
+
+        if self.plot:
+            print(f"system> Plot will be written to {self.renderer.render_interval(result, query)}.")
 
         if self.tables:
             tabulate_interval(result, f"Desease distribution by the {query}.")
 
+    def handle_query(self, user_input: list[str]) -> None:
+
+        try:
+            keys = parse_group_keys(user_input[1:])
+            result: dict[tuple, int] = self.storage.group_by(keys)
+
+        except ValueError as error:
+            print(f"query.error> {error}")
+            return
+
+        tabulate_groups(
+            [*user_input[1:], "Entries"],
+            [[*format_group(keys, group), str(amount)] for group, amount in result.items()],
+            f"Entries grouped by {', '.join(user_input[1:])} ({len(result)} groups)."
+        )
+
+    def handle_watch(self, user_input: list[str]) -> None:
+
+        query: str = user_input[1]
+        seconds: int = 5
+
+        if query not in ["gender", *Storage.PARAMS]:
+            print(f"watch.error> Invalid argument {query}.")
+            return
+
+        if len(user_input) > 2:
+
+            if not user_input[2].isdigit() or int(user_input[2]) < 1:
+                print(f"watch.error> Invalid amount of seconds {user_input[2]}.")
+                return
+
+            seconds = int(user_input[2])
+
+        try:
+            while True:
+
+                rows, self.offset = parser.tail_csv(self.path, self.offset, self.schema)
+
+                # Only the new entries are inserted, nothing is sorted or counted again from the start.
+                self.storage.extend(rows)
+
+                print(f"system> {len(rows)} new entries in {self.path}.")
+                self.handle_dist(["dist", query])
+
+                time.sleep(seconds)
+
+        except KeyboardInterrupt:
+            print("\nsystem> Stopped watching the data set.")
+
     def handle_load(self, user_input: list[str]):
 
         path: str = user_input[1]
@@ -74,10 +221,61 @@ class Interface:
             return
 
         self.path = path
-        self.storage = parser.read_csv(self.path, validator)
+        self.storage = self.read(self.path)
 
         print(f"system> Loaded with sucsess file {path}.")
 
+    def handle_backend(self, user_input: list[str]) -> None:
+
+        arg: str = user_input[1]
+
+        if arg not in BACKENDS:
+            print("backend.error> Invalid command argument, check the help menu.")
+            return
+
+        self.backend = arg
+        self.storage = self.read(self.path)
+
+        print(f"system> Storage backend is now set to {arg}.")
+
+    def handle_workers(self, user_input: list[str]) -> None:
+
+        arg: str = user_input[1]
+
+        if not arg.isdigit() or int(arg) < 1:
+            print("workers.error> Invalid command argument, check the help menu.")
+            return
+
+        self.workers = int(arg)
+
+        print(f"system> Data sets are now loaded with {arg} worker(s).")
+
+    def handle_cache(self, user_input: list[str]) -> None:
+
+        arg: str = user_input[1]
+
+        if arg not in ["stats", "clear"]:
+            print("cache.error> Invalid command argument, check the help menu.")
+            return
+
+        if arg == "clear":
+            self.cache.invalidate()
+            print("system> The data set cache was cleared.")
+            return
+
+        stats: dict = self.cache.stats()
+
+        print(f"system> Cache directory: {self.cache.directory}")
+        print(f"        {stats['hits']} hit(s), {stats['misses']} miss(es), {stats['writes']} write(s).")
+        print(f"        {stats['entries']} data set(s) cached using {stats['bytes']} bytes.")
+
+    def handle_stats(self, _) -> None:
+
+        stats: dict = self.storage.query_cache.stats()
+
+        print(f"system> {stats['size']} of {stats['capacity']} query result(s) cached.")
+        print(f"        {stats['hits']} hit(s), {stats['misses']} miss(es), {stats['evictions']} eviction(s).")
+
     def handle_tables(self, user_input: list[str]) -> None:
 
         arg: str = user_input[1]
@@ -97,11 +295,14 @@ class Interface:
 
         arg: str = user_input[1]
 
-        if arg not in ["on", "off"]:
+        if arg not in ["on", "off", *Renderer.FORMATS]:
             print("plot.error> Invalid command argument, check the help menu.")
             return
 
-        if arg == "on":
+        if arg in Renderer.FORMATS:
+            self.renderer.image_format = arg
+
+        if arg != "off":
             self.plot = True
         else:
             self.plot = False
@@ -116,7 +317,7 @@ class Interface:
             print(f"error> Command {command} does not exist.")
             return
 
-        if len(user_input) > 2:
+        if len(user_input) > self.arguments.get(command, 2):
             print(f"error> Too many arguments.")
             return
 
@@ -141,7 +342,7 @@ class Interface:
 
 
 def main():
-    ui = Interface(inital_path="./datasets/myheart.csv")
+    ui = Interface(inital_path=DEFAULT_DATASET)
 
     try:
         ui.run()
@@ -0,0 +1,76 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class QueryCache:
+    """
+    Least recently used cache of query results, with hit and miss counters.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Class constructor.
+        :param capacity: Maximum amount of results kept, the least recently used one is evicted first.
+        """
+
+        self.capacity = capacity
+        self.results: OrderedDict = OrderedDict()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def get(self, key: Hashable) -> Optional[dict]:
+        """
+        Retrieve a cached result.
+        :param key: The query key, (query, param, interval).
+        :return: The result, or None if it is not cached.
+        """
+
+        if key not in self.results:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.results.move_to_end(key)
+
+        return self.results[key]
+
+    def put(self, key: Hashable, result: dict) -> None:
+        """
+        Cache a result, evicting the least recently used one if the cache is full.
+        :param key: The query key, (query, param, interval).
+        :param result: The query result.
+        :return: None
+        """
+
+        self.results[key] = result
+        self.results.move_to_end(key)
+
+        if len(self.results) > self.capacity:
+            self.results.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Forget every cached result, the counters are kept.
+        :return: None
+        """
+
+        self.results.clear()
+
+    def stats(self) -> dict:
+        """
+        :return: Dictionary with the counters and the amount of cached results.
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.results),
+            "capacity": self.capacity
+        }
@@ -1,14 +1,21 @@
 import os
 
-from typing import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, Optional
 
 from TPC1.models import Entry
 from TPC1.storage import Storage
+from TPC1.aggregate import AggregateStorage
+from TPC1.schema import Schema
 
+# Amount of bytes read from the file at a time by the streaming reader.
+CHUNK_SIZE: int = 1 << 20
 
-def read_csv(file_path: str, validator: Callable[[list[str]], bool]) -> Storage:
 
-    csv_entries: Storage = Storage()
+def read_csv(file_path: str, validator: Callable[[list[str]], bool],
+             storage: Callable[[], Storage] = Storage) -> Storage:
+
+    csv_entries: Storage = storage()
 
     if not os.path.isfile(file_path):
         raise Exception(f"{file_path} is not an existing file.")
@@ -29,5 +36,242 @@ def read_csv(file_path: str, validator: Callable[[list[str]], bool]) -> Storage:
     return csv_entries
 
 
+def split_file(file_path: str, parts: int, end: Optional[int] = None) -> list[tuple[int, int]]:
+    """
+    Splits the body of the csv file (everything after the header) into byte ranges that start and end on a
+    line boundary, so that each range can be read independently.
+
+    :param file_path: Path to the csv file.
+    :param parts: Amount of ranges to split the file into.
+    :param end: Byte offset where to stop, by default the end of the file.
+    :return: List with the (start, end) byte offsets of each range, in file order.
+    """
+
+    size: int = os.path.getsize(file_path) if end is None else end
+
+    with open(file_path, "rb") as csv_file:
+
+        csv_file.readline()
+        bounds: list[int] = [csv_file.tell()]
+
+        for part in range(1, parts):
+
+            csv_file.seek(max(bounds[0] + (size - bounds[0]) * part // parts, bounds[-1]))
+            csv_file.readline()
+
+            bounds.append(csv_file.tell())
+
+    bounds.append(size)
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def complete_end(file_path: str) -> int:
+    """
+    Byte offset right after the last new line of the file, a line still being written (without its new line)
+    starts there.
+
+    :param file_path: Path to the csv file.
+    :return: The offset, 0 if the file has no new line.
+    """
+
+    with open(file_path, "rb") as csv_file:
+
+        end: int = csv_file.seek(0, os.SEEK_END)
+
+        while end > 0:
+
+            start: int = max(0, end - CHUNK_SIZE)
+            csv_file.seek(start)
+
+            if (position := csv_file.read(end - start).rfind(b"\n")) >= 0:
+                return start + position + 1
+
+            end = start
+
+    return 0
+
+
+def read_blocks(file_path: str, chunk_size: int = CHUNK_SIZE,
+                start: Optional[int] = None, end: Optional[int] = None) -> Iterator[str]:
+    """
+    Reads the csv file in fixed-size chunks and yields the complete lines of each chunk as a single block of text.
+    A line cut in half by the chunk boundary is carried over to the next chunk.
+
+    :param file_path: Path to the csv file.
+    :param chunk_size: Amount of bytes to read at a time.
+    :param start: Byte offset of the first line to read, by default the line after the header.
+    :param end: Byte offset where to stop reading, by default the end of the file.
+    :return: Iterator over blocks of lines separated by new lines.
+    """
+
+    if not os.path.isfile(file_path):
+        raise Exception(f"{file_path} is not an existing file.")
+
+    with open(file_path, "rb") as csv_file:
+
+        if start is None:
+            csv_file.readline()
+            start = csv_file.tell()
+
+        csv_file.seek(start)
+
+        remaining: int = (os.path.getsize(file_path) if end is None else end) - start
+        remainder: bytes = b""
+
+        while remaining > 0 and (chunk := csv_file.read(min(chunk_size, remaining))):
+
+            remaining -= len(chunk)
+            block, newline, remainder = (remainder + chunk).rpartition(b"\n")
+
+            if newline:
+                yield block.decode()
+
+        if remainder:
+            yield remainder.decode()
+
+
+def read_chunks(file_path: str, chunk_size: int = CHUNK_SIZE,
+                start: Optional[int] = None, end: Optional[int] = None) -> Iterator[list[list[str]]]:
+    """
+    Reads the csv file in fixed-size chunks and yields the complete lines of each chunk, already split.
+
+    :param file_path: Path to the csv file.
+    :param chunk_size: Amount of bytes to read at a time.
+    :param start: Byte offset of the first line to read, by default the line after the header.
+    :param end: Byte offset where to stop reading, by default the end of the file.
+    :return: Iterator over batches of split lines.
+    """
+
+    for block in read_blocks(file_path, chunk_size, start, end):
+        yield [line.split(",") for line in block.split("\n") if line]
+
+
+def tail_csv(file_path: str, offset: int, schema: Optional[Schema] = None) -> tuple[list, int]:
+    """
+    Reads the complete lines appended to the csv file after a byte offset, a line still being written is left
+    for the next call.
+
+    :param file_path: Path to the csv file.
+    :param offset: Byte offset where the previous read stopped.
+    :param schema: If given, only the lines valid according to it are returned (the others are rejected).
+    :return: Tuple with the new lines, already split, and the offset where this read stopped.
+    """
+
+    with open(file_path, "rb") as csv_file:
+        csv_file.seek(offset)
+        block, newline, _ = csv_file.read().rpartition(b"\n")
+
+    if not newline:
+        return [], offset
+
+    if schema is None:
+        return [line.split(",") for line in block.decode().split("\n") if line], offset + len(block) + 1
+
+    rows, rejected = schema.validate(block.decode())
+    schema.reject(rejected)
+
+    return rows, offset + len(block) + 1
+
+
+def read_part(file_path: str, validator: Callable[[list[str]], bool], storage: Callable[[], Storage],
+              chunk_size: int = CHUNK_SIZE, start: Optional[int] = None, end: Optional[int] = None,
+              schema: Optional[Schema] = None) -> Storage:
+    """
+    Loads a byte range of the csv file into a new, unfinished, storage.
+
+    :param file_path: Path to the csv file.
+    :param validator: Function that decides if a line should be stored, not used if a schema is given.
+    :param storage: Storage class to build.
+    :param chunk_size: Amount of bytes to read at a time.
+    :param start: Byte offset of the first line to read, by default the line after the header.
+    :param end: Byte offset where to stop reading, by default the end of the file.
+    :param schema: Schema that validates whole chunks at once, the rejected lines are counted in the storage.
+    :return: Storage object with the read data.
+    """
+
+    csv_entries: Storage = storage()
+
+    if schema is None:
+
+        for rows in read_chunks(file_path, chunk_size, start, end):
+            csv_entries.add_batch([row for row in rows if validator(row)])
+
+        return csv_entries
+
+    for block in read_blocks(file_path, chunk_size, start, end):
+
+        rows, rejected = schema.validate(block)
+
+        csv_entries.add_batch(rows)
+        csv_entries.rejected_entries += len(rejected)
+
+        schema.reject(rejected)
+
+    return csv_entries
+
+
+def read_csv_streaming(file_path: str, validator: Callable[[list[str]], bool],
+                       storage: Callable[[], Storage] = AggregateStorage, chunk_size: int = CHUNK_SIZE,
+                       schema: Optional[Schema] = None, end: Optional[int] = None) -> Storage:
+    """
+    Loads the csv file chunk by chunk, feeding each batch of lines to the storage at once.
+    With the default AggregateStorage only counters are kept, so the memory used is bounded by the chunk size.
+
+    :param file_path: Path to the csv file.
+    :param validator: Function that decides if a line should be stored.
+    :param storage: Storage class to build.
+    :param chunk_size: Amount of bytes to read at a time.
+    :param schema: Schema that validates whole chunks at once, used instead of the validator.
+    :param end: Byte offset where to stop reading, by default the end of the file.
+    :return: Storage object with the read data.
+    """
+
+    csv_entries: Storage = read_part(file_path, validator, storage, chunk_size, end=end, schema=schema)
+    csv_entries.finish()
+
+    return csv_entries
+
+
+def read_csv_parallel(file_path: str, validator: Callable[[list[str]], bool],
+                      storage: Callable[[], Storage] = AggregateStorage, workers: Optional[int] = None,
+                      chunk_size: int = CHUNK_SIZE, schema: Optional[Schema] = None,
+                      end: Optional[int] = None) -> Storage:
+    """
+    Loads the csv file using a pool of processes, each one reads a range of lines into its own storage and the
+    partial storages are merged, in file order, once they are done.
+    The validator is sent to the workers, so it needs to be picklable (a module level function, not a lambda).
+
+    :param file_path: Path to the csv file.
+    :param validator: Function that decides if a line should be stored.
+    :param storage: Storage class to build.
+    :param workers: Amount of processes to use, by default the number of CPUs.
+    :param chunk_size: Amount of bytes each process reads at a time.
+    :param schema: Schema that validates whole chunks at once, used instead of the validator.
+    :param end: Byte offset where to stop reading, by default the end of the file.
+    :return: Storage object with the read data.
+    """
+
+    if not os.path.isfile(file_path):
+        raise Exception(f"{file_path} is not an existing file.")
+
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        return read_csv_streaming(file_path, validator, storage, chunk_size, schema, end)
+
+    csv_entries: Storage = storage()
 
+    with ProcessPoolExecutor(max_workers=workers) as executor:
 
+        partials = [
+            executor.submit(read_part, file_path, validator, storage, chunk_size, start, part_end, schema)
+            for start, part_end in split_file(file_path, workers, end)
+        ]
+
+        for partial in partials:
+            csv_entries.merge(partial.result())
+
+    csv_entries.finish()
+
+    return csv_entries
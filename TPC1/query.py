@@ -0,0 +1,69 @@
+from dataclasses import fields
+from typing import Optional
+
+from TPC1.models import Entry
+
+# Every attribute of an entry can be grouped by.
+FIELDS: tuple[str, ...] = tuple(field.name for field in fields(Entry))
+
+# Attributes that can be split into intervals.
+NUMERIC_FIELDS: tuple[str, ...] = ("age", "tension", "cholestrol", "bpm")
+
+GroupKey = tuple[str, Optional[int]]
+
+
+def parse_group_keys(specs: list[str]) -> list[GroupKey]:
+    """
+    Parses the group-by keys of a query, each one is an attribute name optionally followed by an interval size.
+
+    Example:
+        $> parse_group_keys(["age:10", "sex", "has_desease"])
+        $> [("age", 10), ("sex", None), ("has_desease", None)]
+
+    :param specs: List of keys as written by the user.
+    :return: List of (attribute, interval) pairs, the interval is None when the attribute is not split.
+    """
+
+    keys: list[GroupKey] = []
+
+    if not specs:
+        raise ValueError("At least one attribute is needed.")
+
+    for spec in specs:
+
+        name, _, width = spec.partition(":")
+
+        if name not in FIELDS:
+            raise ValueError(f"Unknown attribute {name}.")
+
+        if name in [key[0] for key in keys]:
+            raise ValueError(f"Attribute {name} is repeated.")
+
+        if not width:
+            keys.append((name, None))
+            continue
+
+        if name not in NUMERIC_FIELDS:
+            raise ValueError(f"Attribute {name} can't be split into intervals.")
+
+        if not width.isdigit() or int(width) < 1:
+            raise ValueError(f"Invalid interval {width}.")
+
+        keys.append((name, int(width)))
+
+    return keys
+
+
+def format_group(keys: list[GroupKey], group: tuple) -> list[str]:
+    """
+    Formats the values of a group, intervals are shown as '[lo-hi['.
+
+    :param keys: The group-by keys of the query.
+    :param group: The values of the group, one per key.
+    :return: List with the formatted values.
+    """
+
+    return [
+        f"[{value}-{value + width}[" if width else str(value)
+        for (_, width), value in zip(keys, group)
+    ]
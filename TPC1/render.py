@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+
+class Renderer:
+    """
+    Draws the plots of query results into image files on a background thread, so the prompt is never blocked.
+
+    Plots are drawn with matplotlib's object oriented API on the headless Agg canvas (no window, no pyplot), and
+    matplotlib is only imported by the first plot. Files are named after the query and a hash of its result, so
+    asking for the same result again reuses the file already written.
+    """
+
+    FORMATS: tuple[str, ...] = ("png", "svg")
+
+    def __init__(self, directory: str = "plots", image_format: str = "png"):
+        """
+        Class constructor.
+        :param directory: Where to write the plots.
+        :param image_format: Format of the plots, one of FORMATS.
+        """
+
+        self.directory = directory
+        self.image_format = image_format
+
+        # A single thread, matplotlib is not meant to draw from several threads at once.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="renderer")
+        self.rendered: dict[str, Future] = {}
+
+    def __file_path__(self, name: str, result: dict) -> str:
+        digest: str = hashlib.sha1(json.dumps(result, sort_keys=True).encode()).hexdigest()[:12]
+        return os.path.join(self.directory, f"{name}-{digest}.{self.image_format}")
+
+    def __submit__(self, name: str, result: dict, draw, *args) -> str:
+
+        file_path: str = self.__file_path__(name, result)
+
+        if file_path not in self.rendered and not os.path.isfile(file_path):
+            future: Future = self.executor.submit(draw, file_path, *args)
+            self.rendered[file_path] = future
+            future.add_done_callback(lambda done: self.__report__(file_path, done))
+
+        return file_path
+
+    def __report__(self, file_path: str, future: Future) -> None:
+
+        # A failed plot is reported and forgotten, so asking for it again draws it again.
+        if (error := future.exception()) is not None:
+            self.rendered.pop(file_path, None)
+            print(f"\nplot.error> Could not write {file_path}: {error}")
+
+    def render_gender(self, result: dict) -> str:
+        """
+        Queue the pie charts of the distribution of the desease by gender.
+        :param result: Result of 'Storage.dist_sick_by_gender'.
+        :return: Path of the file the plot is (or will be) written to.
+        """
+
+        return self.__submit__("gender", result, draw_gender, result)
+
+    def render_interval(self, result: dict, param: str) -> str:
+        """
+        Queue the bar plot of the distribution of the desease by intervals of a parameter.
+        :param result: Result of 'Storage.dist_sick_by_param_interval'.
+        :param param: The parameter of the distribution.
+        :return: Path of the file the plot is (or will be) written to.
+        """
+
+        return self.__submit__(param, result, draw_interval, result, param)
+
+    def wait(self) -> None:
+        """
+        Block until every queued plot is written, failed plots are reported as they fail (see '__report__').
+        :return: None
+        """
+
+        wait(list(self.rendered.values()))
+
+
+def draw_gender(file_path: str, result: dict) -> None:
+    """
+    Draw on two pie charts the distribution of the desease by gender.
+
+    :param file_path: Where to write the plot.
+    :param result: Result of 'Storage.dist_sick_by_gender'.
+    :return: None
+    """
+
+    from matplotlib.figure import Figure
+
+    sick_males, healthy_males = result["sick_males"], result["healthy_males"]
+    sick_females, healthy_females = result["sick_females"], result["healthy_females"]
+
+    fig = Figure(figsize=(10, 5))
+    ax1, ax2 = fig.subplots(1, 2)
+
+    fig.suptitle("Distribution of the desease by gender.")
+
+    ax1.pie([sick_males, healthy_males], autopct='%1.1f%%')
+    ax1.set_title(f"Males ({sick_males + healthy_males} Total)\nSick: {sick_males}, Healthy: {healthy_males}")
+    ax1.legend(["Has Desease", "Healthy"])
+
+    ax2.pie([sick_females, healthy_females], autopct='%1.1f%%')
+    ax2.set_title(
+        f"Females ({sick_females + healthy_females} Total)\nSick: {sick_females}, Healthy: {healthy_females}")
+    ax2.legend(["Has Desease", "Healthy"])
+
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    fig.savefig(file_path)
+
+
+def draw_interval(file_path: str, result: dict, param: str) -> None:
+    """
+    Draw as a bar plot the distribution of the desease by intervals of a parameter.
+
+    :param file_path: Where to write the plot.
+    :param result: Result of 'Storage.dist_sick_by_param_interval'.
+    :param param: The parameter of the distribution.
+    :return: None
+    """
+
+    from matplotlib.figure import Figure
+
+    keys: list[str] = list(result["sick"].keys())
+    xaxis: list[int] = list(range(len(keys)))
+
+    # Plotting the data.
+    bar_width = 0.35
+
+    fig = Figure(figsize=(max(6.4, len(keys) * 0.6), 4.8))
+    ax = fig.subplots()
+
+    sick_bar = ax.bar([x - 0.2 for x in xaxis], list(result["sick"].values()), width=bar_width, label='Sick')
+    healthy_bar = ax.bar([x + 0.2 for x in xaxis], list(result["healthy"].values()), width=bar_width, label='Healthy')
+
+    ax.set_xticks(xaxis, keys, rotation=45)
+    ax.set_xlabel(f"{param.title()} Intervals")
+    ax.set_ylabel("Number of People")
+    ax.set_title(f"Distribution of the desease by {param} intervals.")
+
+    ax.bar_label(sick_bar)
+    ax.bar_label(healthy_bar)
+
+    ax.legend()
+    fig.tight_layout()
+
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    fig.savefig(file_path)
@@ -0,0 +1,118 @@
+import re
+
+from dataclasses import dataclass, field
+from itertools import compress
+from operator import not_
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    Dataclass that describes a column of the csv file.
+    """
+
+    name: str
+    minimum: Optional[int] = None
+    maximum: Optional[int] = None
+    categories: tuple[str, ...] = ()
+
+    @property
+    def expression(self) -> str:
+        """
+        :return: Regular expression group that matches a valid value of the column.
+        """
+
+        if self.categories:
+            return "(" + "|".join(re.escape(category) for category in self.categories) + ")"
+
+        return r"(-?\d+)" if self.minimum is None or self.minimum < 0 else r"(\d+)"
+
+
+@dataclass
+class Schema:
+    """
+    Declarative validator of the lines of a csv file, checks whole blocks of lines at once.
+
+    The shape of every line (amount of columns, integers, allowed categories) is checked by a single compiled
+    regular expression over the whole block, and the ranges of the integer columns with built-in functions mapped
+    over each column, so there is no Python function call per line.
+    Rejected lines are counted and, if 'reject_path' is set, appended to that file.
+    """
+
+    fields: tuple[Field, ...]
+    reject_path: Optional[str] = None
+    pattern: re.Pattern = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.pattern = re.compile(
+            "^" + ",".join(column.expression for column in self.fields) + r"\r?$", re.MULTILINE
+        )
+
+    def validate(self, block: str) -> tuple[list[tuple[str, ...]], list[str]]:
+        """
+        Validate a block of lines.
+
+        :param block: Lines of the csv file separated by new lines, without the header.
+        :return: Tuple with the valid lines, already split, and the rejected lines.
+        """
+
+        rows: list[tuple[str, ...]] = self.pattern.findall(block)
+        rejected: list[str] = []
+
+        # Lines that don't even have the right shape are whatever is left once the valid ones are removed.
+        if len(rows) != block.count("\n") + 1:
+            rejected = [line for line in self.pattern.sub("", block).split("\n") if line.strip()]
+
+        if not rows:
+            return rows, rejected
+
+        columns: list[tuple[str, ...]] = list(zip(*rows))
+        masks: list = []
+
+        for position, column in enumerate(self.fields):
+
+            if column.minimum is None and column.maximum is None:
+                continue
+
+            values: list[int] = list(map(int, columns[position]))
+
+            if column.minimum is not None:
+                masks.append(map(column.minimum.__le__, values))
+
+            if column.maximum is not None:
+                masks.append(map(column.maximum.__ge__, values))
+
+        if not masks:
+            return rows, rejected
+
+        valid: list[bool] = list(map(all, zip(*masks))) if len(masks) > 1 else list(masks[0])
+
+        if all(valid):
+            return rows, rejected
+
+        rejected.extend(map(",".join, compress(rows, map(not_, valid))))
+
+        return list(compress(rows, valid)), rejected
+
+    def reject(self, lines: list[str]) -> None:
+        """
+        Append rejected lines to the side file, if there is one.
+        :param lines: The rejected lines.
+        :return: None
+        """
+
+        if lines and self.reject_path is not None:
+            with open(self.reject_path, "a") as reject_file:
+                reject_file.write("".join(line.rstrip("\r") + "\n" for line in lines))
+
+
+# Schema of the 'myheart.csv' data sets: idade,sexo,tensão,colesterol,batimento,temDoença
+HEART_SCHEMA: Schema = Schema((
+    Field("age", 0, 150),
+    Field("sex", categories=("M", "F")),
+    Field("tension", 0, 400),
+    Field("cholestrol", 0, 1500),
+    Field("bpm", 0, 400),
+    Field("has_desease", categories=("0", "1"))
+))
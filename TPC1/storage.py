@@ -1,9 +1,13 @@
-import matplotlib.pyplot as plot
-import numpy as np
-
+from bisect import insort
+from collections import Counter
+from dataclasses import fields
 from math import floor
+from operator import attrgetter
 
+from TPC1.index import PrefixIndex
+from TPC1.memo import QueryCache
 from TPC1.models import Entry
+from TPC1.query import GroupKey
 
 
 class Storage:
@@ -11,6 +15,9 @@ class Storage:
     Class that stores and organizes data from the csv file.
     """
 
+    # Numeric attributes of an entry.
+    PARAMS: tuple[str, ...] = ("age", "tension", "cholestrol", "bpm")
+
     def __init__(self):
         """
         Class constructor.
@@ -18,6 +25,18 @@ class Storage:
 
         self.total_entries: int = 0
 
+        # Lines of the csv file rejected by the schema while loading.
+        self.rejected_entries: int = 0
+
+        # Once finished, entries are inserted in order instead of sorting everything again.
+        self.finished: bool = False
+
+        # Attribute -> prefix-sum index over its values, built on 'finish()'.
+        self.indexes: dict[str, PrefixIndex] = {}
+
+        # (query, param, interval) -> result of the query.
+        self.query_cache: QueryCache = QueryCache()
+
         self.data = {
 
             "healthy": {
@@ -36,6 +55,9 @@ class Storage:
 
         }
 
+    def __len__(self) -> int:
+        return len(self.data["sick"]["age_sorted"]) + len(self.data["healthy"]["age_sorted"])
+
     @staticmethod
     def is_sick(entry: Entry) -> str:
         return "sick" if entry.has_desease else "healthy"
@@ -47,10 +69,72 @@ class Storage:
         :return: None
         """
         status: str = self.is_sick(entry)
+        self.invalidate()
 
         self.data[status][entry.sex].append(entry)
-        self.data[status]["age_sorted"].append(entry)
-        self.data[status]["col_sorted"].append(entry)
+
+        if self.finished:
+            insort(self.data[status]["age_sorted"], entry, key=lambda e: e.age)
+            insort(self.data[status]["col_sorted"], entry, key=lambda e: e.cholestrol)
+
+        else:
+            self.data[status]["age_sorted"].append(entry)
+            self.data[status]["col_sorted"].append(entry)
+
+    def add_batch(self, rows: list[list[str]]) -> None:
+        """
+        Insert a batch of already split csv lines into the storage.
+        :param rows: List of csv lines, each one as a list of strings.
+        :return: None
+        """
+
+        for row in rows:
+            self.add(Entry.from_line(row))
+
+    def extend(self, rows: list[list[str]]) -> None:
+        """
+        Insert a batch of new csv lines into a finished storage, the indexes are updated with the counts of the
+        batch instead of being built again from every entry.
+        :param rows: List of csv lines, each one as a list of strings.
+        :return: None
+        """
+
+        if not rows:
+            return
+
+        indexes: dict[str, PrefixIndex] = self.indexes
+        self.add_batch(rows)
+
+        columns: dict[str, tuple] = dict(zip((field.name for field in fields(Entry)), zip(*rows)))
+        sicks: list[int] = list(map(int, columns["has_desease"]))
+
+        for param, index in indexes.items():
+            index.update(Counter(zip(map(int, columns[param]), sicks)))
+
+        self.indexes = indexes
+
+    def merge(self, other: 'Storage') -> None:
+        """
+        Insert every entry of another (unfinished) storage, used to join storages loaded in parallel.
+        :param other: Storage to merge into this one.
+        :return: None
+        """
+
+        self.invalidate()
+        self.rejected_entries += other.rejected_entries
+
+        for status in self.data:
+            for key in self.data[status]:
+                self.data[status][key].extend(other.data[status][key])
+
+    def invalidate(self) -> None:
+        """
+        Forget the indexes and cached query results, called whenever entries are added.
+        :return: None
+        """
+
+        self.indexes = {}
+        self.query_cache.clear()
 
     def finish(self) -> None:
         """
@@ -64,6 +148,96 @@ class Storage:
         self.data["healthy"]["age_sorted"].sort(key=lambda e: e.age)
         self.data["healthy"]["col_sorted"].sort(key=lambda e: e.cholestrol)
 
+        self.finished = True
+        self.build_indexes()
+
+    def build_indexes(self) -> None:
+        """
+        Build the prefix-sum index of every numeric attribute.
+        :return: None
+        """
+
+        self.indexes = {param: PrefixIndex(self.count_values(param)) for param in self.PARAMS}
+
+    def count_values(self, param: str) -> dict[tuple[int, int], int]:
+        """
+        Count the entries that share the same value of an attribute and desease status.
+        :param param: Name of the attribute.
+        :return: Dictionary with the amount of entries for every (value, has_desease) pair.
+        """
+
+        counts: Counter = Counter()
+
+        for sick, status in enumerate(["healthy", "sick"]):
+            counts.update((getattr(entry, param), sick) for entry in self.data[status]["age_sorted"])
+
+        return counts
+
+    def index(self, param: str) -> PrefixIndex:
+        """
+        Retrieve the prefix-sum index of an attribute, building it if needed.
+        :param param: Name of the attribute.
+        :return: The index.
+        """
+
+        if param not in self.indexes:
+            self.indexes[param] = PrefixIndex(self.count_values(param))
+
+        return self.indexes[param]
+
+    def count_groups(self, keys: list[GroupKey]) -> dict[tuple, int]:
+        """
+        Count the entries of every group, in a single pass over the entries.
+        :param keys: The (attribute, interval) pairs to group by.
+        :return: Dictionary with the amount of entries of every group.
+        """
+
+        entries: list[Entry] = self.data["healthy"]["age_sorted"] + self.data["sick"]["age_sorted"]
+        getter = attrgetter(*[name for name, _ in keys])
+
+        groups = map(getter, entries) if len(keys) > 1 else zip(map(getter, entries))
+
+        if any(width for _, width in keys):
+            groups = (
+                tuple(value // width * width if width else value for value, (_, width) in zip(group, keys))
+                for group in groups
+            )
+
+        return Counter(groups)
+
+    def group_by(self, keys: list[GroupKey]) -> dict[tuple, int]:
+        """
+        Calculate the amount of entries of every combination of attribute values (or intervals).
+
+        Example:
+            $> group_by([("age", 10), ("sex", None), ("has_desease", None)])
+            $> {(20, "F", False): 3, (20, "M", False): 1, ..., (70, "M", True): 17}
+
+        :param keys: The (attribute, interval) pairs to group by, numeric attributes are split into intervals
+                     when the interval is not None.
+        :return: Dictionary with the amount of entries of every group, ordered by group.
+        """
+
+        if (result := self.query_cache.get(("group_by", tuple(keys), None))) is None:
+
+            result = dict(sorted(self.count_groups(keys).items()))
+            self.query_cache.put(("group_by", tuple(keys), None), result)
+
+        return result
+
+    def count_genders(self) -> tuple[int, int, int, int]:
+        """
+        Count the entries by gender and desease status.
+        :return: Tuple with the amount of sick males, sick females, healthy males and healthy females.
+        """
+
+        return (
+            len(self.data["sick"]["M"]),
+            len(self.data["sick"]["F"]),
+            len(self.data["healthy"]["M"]),
+            len(self.data["healthy"]["F"])
+        )
+
     def dist_sick_by_gender(self, display: bool = False) -> dict:
         """
         Calculate the distribution of sick people by their gender.
@@ -72,28 +246,31 @@ class Storage:
         :return: Dictionary with the distribution data.
         """
 
-        sick_males: int = len(self.data["sick"]["M"])
-        sick_females: int = len(self.data["sick"]["F"])
+        if (result := self.query_cache.get(("gender", None, None))) is None:
 
-        healthy_males: int = len(self.data["healthy"]["M"])
-        healthy_females: int = len(self.data["healthy"]["F"])
+            sick_males, sick_females, healthy_males, healthy_females = self.count_genders()
 
-        if display:
-            self.display_gender(sick_males, sick_females, healthy_males, healthy_females)
+            result = {
+                "healthy_males": healthy_males,
+                "healthy_females": healthy_females,
+                "total_males": sick_males + healthy_males,
 
-        return {
-            "healthy_males": healthy_males,
-            "healthy_females": healthy_females,
-            "total_males": sick_males + healthy_males,
+                "sick_males": sick_males,
+                "sick_females": sick_females,
+                "total_females": sick_females + healthy_females
+            }
 
-            "sick_males": sick_males,
-            "sick_females": sick_females,
-            "total_females": sick_females + healthy_females
-        }
+            self.query_cache.put(("gender", None, None), result)
+
+        if display:
+            self.display_gender(result["sick_males"], result["sick_females"],
+                                result["healthy_males"], result["healthy_females"])
+
+        return result
 
     def dist_sick_by_param_interval(self, interval: int = 5, param: str = "age", display: bool = False) -> dict:
         """
-        Calculate the distribution of the desease by age intervals.
+        Calculate the distribution of the desease by intervals of a parameter.
 
         :param param: Distribution by this parameter.
         :param interval: The interval size.
@@ -101,58 +278,43 @@ class Storage:
         :return: Dictionary with the distribution data.
         """
 
-        key: str = "age_sorted"
+        if (result := self.query_cache.get(("interval", param, interval))) is None:
 
-        if param == "cholestrol":
-            key = "col_sorted"
+            # Query computing, one subtraction of prefix sums per interval.
+            index: PrefixIndex = self.index(param)
+            filtered_sick, filtered_healthy = index.histogram(interval)
 
-        # Query computing.
-        sick: list[int] = list(map(lambda e: getattr(e, param), self.data["sick"][key]))
-        healthy: list[int] = list(map(lambda e: getattr(e, param), self.data["healthy"][key]))
+            result = {
+                "sick": filtered_sick,
+                "total_sick": index.total_sick,
+                "healthy": filtered_healthy,
+                "total_healthy": index.total_healthy
+            }
 
-        range_limit: int = max(sick + healthy)
-
-        filtered_sick = self.__filter_by_param__(sick, interval, range_limit)
-        filtered_healthy = self.__filter_by_param__(healthy, interval, range_limit)
+            self.query_cache.put(("interval", param, interval), result)
 
         # Display the graph.
         if display:
-            self.display_interval_as_bar_plot(filtered_sick, filtered_healthy, param)
+            self.display_interval_as_bar_plot(result["sick"], result["healthy"], param)
 
-        return {
-            "sick": filtered_sick,
-            "total_sick": len(sick),
-            "healthy": filtered_healthy,
-            "total_healthy": len(healthy)
-        }
+        return result
 
-    def __filter_by_param__(self, values: list[int], interval: int, range_limit: int) -> dict:
+    def dist_sick_by_param_range(self, lo: int, hi: int, param: str = "age") -> dict:
         """
-        Filters a list of sorted ages into their respective bins (age intervals).
+        Calculate the amount of sick and healthy people with a parameter inside [lo, hi[.
 
-        :param values: List containing the values sorted from least to greater.
-        :param interval: The size of interval.
-        :param range_limit: The max value registered on the values list.
-        :return: Dictionary with the intervals with the respective amount of people.
+        :param lo: Lower bound, inclusive.
+        :param hi: Upper bound, exclusive.
+        :param param: Distribution by this parameter.
+        :return: Dictionary with the distribution data.
         """
 
-        result: dict = {}
-
-        superior_limit_group: int = self.__get_group__(range_limit, interval)
-        ranges: list[int] = self.__get_ranges__(-interval, superior_limit_group, interval)
-
-        # Initialize the resulting dictionary with every range with 0.
-        for r in ranges:
-            interval_fmt: str = f"[{r}-{r + interval}["
-            result[interval_fmt] = 0
-
-        # Sort the values by their 'bins'.
-        for value in values:
-            group: int = self.__get_group__(value, interval)
-            interval_fmt: str = f"[{group}-{group + interval}["
-            result[interval_fmt] += 1
+        sick, healthy = self.index(param).count(lo, hi)
 
-        return result
+        return {
+            "sick": sick,
+            "healthy": healthy
+        }
 
     # Display #
 
@@ -168,6 +330,8 @@ class Storage:
         :return: None
         """
 
+        import matplotlib.pyplot as plot
+
         fig, (ax1, ax2) = plot.subplots(1, 2, figsize=(10, 5))
 
         fig.suptitle("Distribution of the desease by gender.")
@@ -194,6 +358,9 @@ class Storage:
         :return: None
         """
 
+        import matplotlib.pyplot as plot
+        import numpy as np
+
         keys = sick.keys()
 
         sick_values = sick.values()
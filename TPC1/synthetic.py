@@ -0,0 +1,118 @@
+"""
+Seeded generator of synthetic data sets with the same schema as 'datasets/myheart.csv'.
+
+Usage (from the repository root):
+    $> python -m TPC1.synthetic 1e6 --seed 0 --output datasets/synthetic-1e6.csv
+"""
+
+import argparse
+import random
+
+from TPC1.columnar import load_numpy
+
+HEADER: str = "idade,sexo,tensão,colesterol,batimento,temDoença\n"
+
+# Entries generated (and written) at a time, keeps the memory flat for any size.
+BATCH_SIZE: int = 1 << 16
+
+
+def generate_batch_numpy(generator, rows: int) -> str:
+    """
+    Generates a batch of csv lines with NumPy.
+
+    :param generator: A 'numpy.random.Generator'.
+    :param rows: Amount of lines to generate.
+    :return: The lines, each one ending with a new line.
+    """
+
+    np = load_numpy()
+
+    age = np.clip(generator.normal(54, 9, rows), 28, 77).astype(np.int64)
+    male = generator.random(rows) < 0.79
+    tension = np.clip(generator.normal(132, 18, rows), 80, 200).astype(np.int64)
+    cholestrol = np.clip(generator.normal(240, 55, rows), 85, 603).astype(np.int64)
+    bpm = np.clip(generator.normal(137, 25, rows), 60, 202).astype(np.int64)
+
+    # About a fifth of the original entries have no cholestrol measure (0).
+    cholestrol[generator.random(rows) < 0.19] = 0
+
+    chance = 0.15 + 0.35 * male + 0.012 * (age - 54) + 0.003 * (tension - 132) - 0.004 * (bpm - 137)
+    sick = generator.random(rows) < chance
+
+    sex = np.where(male, "M", "F")
+
+    return "".join(
+        f"{a},{s},{t},{c},{b},{d}\n"
+        for a, s, t, c, b, d in zip(age.tolist(), sex.tolist(), tension.tolist(), cholestrol.tolist(),
+                                    bpm.tolist(), sick.astype(np.int8).tolist())
+    )
+
+
+def generate_batch_python(generator: random.Random, rows: int) -> str:
+    """
+    Generates a batch of csv lines with the 'random' module, used when NumPy is not installed.
+
+    :param generator: A 'random.Random'.
+    :param rows: Amount of lines to generate.
+    :return: The lines, each one ending with a new line.
+    """
+
+    lines: list[str] = []
+
+    for _ in range(rows):
+
+        age: int = int(min(max(generator.gauss(54, 9), 28), 77))
+        male: bool = generator.random() < 0.79
+        tension: int = int(min(max(generator.gauss(132, 18), 80), 200))
+        cholestrol: int = 0 if generator.random() < 0.19 else int(min(max(generator.gauss(240, 55), 85), 603))
+        bpm: int = int(min(max(generator.gauss(137, 25), 60), 202))
+
+        chance: float = 0.15 + 0.35 * male + 0.012 * (age - 54) + 0.003 * (tension - 132) - 0.004 * (bpm - 137)
+        sick: int = int(generator.random() < chance)
+
+        lines.append(f"{age},{'M' if male else 'F'},{tension},{cholestrol},{bpm},{sick}\n")
+
+    return "".join(lines)
+
+
+def generate(file_path: str, rows: int, seed: int = 0) -> None:
+    """
+    Writes a synthetic data set, the same seed and size always give the same file (for the same engine,
+    NumPy when installed, the 'random' module otherwise).
+
+    :param file_path: Where to write the csv file.
+    :param rows: Amount of entries to generate, from a thousand up to hundreds of millions.
+    :param seed: Seed of the random generator.
+    :return: None
+    """
+
+    np = load_numpy()
+
+    if np is not None:
+        generator, generate_batch = np.random.default_rng(seed), generate_batch_numpy
+    else:
+        generator, generate_batch = random.Random(seed), generate_batch_python
+
+    with open(file_path, "w") as csv_file:
+
+        csv_file.write(HEADER)
+
+        for start in range(0, rows, BATCH_SIZE):
+            csv_file.write(generate_batch(generator, min(BATCH_SIZE, rows - start)))
+
+
+def main():
+
+    arguments = argparse.ArgumentParser(description="Synthetic heart desease data sets.")
+
+    arguments.add_argument("rows", type=lambda value: int(float(value)), help="Amount of entries, e.g. 1e6.")
+    arguments.add_argument("--seed", type=int, default=0)
+    arguments.add_argument("--output", required=True, help="Where to write the csv file.")
+
+    args = arguments.parse_args()
+
+    generate(args.output, args.rows, args.seed)
+
+
+if __name__ == '__main__':
+    SystemExit(main())
@@ -57,3 +57,21 @@ def tabulate_gender(query_result: dict, description: str) -> None:
     print(female_row)
     print(header_row)
     print(description)
+
+
+def tabulate_groups(headers: list[str], rows: list[list[str]], description: str) -> None:
+
+    widths: list[int] = [max([len(header)] + [len(row[i]) for row in rows]) for i, header in enumerate(headers)]
+
+    header_row: str = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    header_val: str = "| " + " | ".join(h + " " * (width - len(h)) for h, width in zip(headers, widths)) + " |"
+
+    print(header_row)
+    print(header_val)
+    print(header_row)
+
+    for row in rows:
+        print("| " + " | ".join(value + " " * (width - len(value)) for value, width in zip(row, widths)) + " |")
+
+    print(header_row)
+    print(description)
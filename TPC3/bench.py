@@ -0,0 +1,280 @@
+"""
+Benchmarks for the processing of 'processos.txt'.
+
+Usage (from this folder):
+    $> python bench.py dist processos.txt --copies 10
+    $> python bench.py records processos.txt --copies 10
+    $> python bench.py stream processos.txt --copies 10
+    $> python bench.py parallel processos.txt --copies 10 --workers 1 2 4 8
+    $> python bench.py sketch processos.txt --copies 10 --epsilons 0.01 0.001
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from main import Storage, parse
+from parallel import compute_parallel
+from records import parse_records
+from sketch import SketchDistributions
+from stream import compute_streaming, count_matches, iter_matches
+
+
+def replicate(file_path: str, copies: int, directory: str) -> str:
+    """
+    Writes a file with the lines of another one repeated.
+
+    :param file_path: File to replicate.
+    :param copies: Amount of times its lines are written.
+    :param directory: Where to write the new file.
+    :return: Path of the new file.
+    """
+
+    replicated: str = os.path.join(directory, f"{copies}x-{os.path.basename(file_path)}")
+
+    with open(replicated, "wb") as output:
+        for _ in range(copies):
+            with open(file_path, "rb") as file:
+                shutil.copyfileobj(file, output)
+
+    return replicated
+
+
+def bench_dist(file_path: str) -> None:
+    """
+    Times the three 'dist_by_*' methods, one after the other, against 'compute_all' and checks they agree.
+
+    :param file_path: File to parse.
+    :return: None
+    """
+
+    data: Storage = parse(file_path)
+
+    start: float = time.perf_counter()
+    separate: dict = {"year": data.dist_by_year(), "names": data.dist_by_names(),
+                      "relations": data.dist_by_relationship()}
+    elapsed: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single: dict = data.compute_all()
+    single_pass: float = time.perf_counter() - start
+
+    print(f"{'approach':>12} | {'entries':>9} | {'seconds':>8}")
+    print(f"{'dist_by_*':>12} | {len(data.all):>9} | {elapsed:>8.3f}")
+    print(f"{'compute_all':>12} | {len(data.all):>9} | {single_pass:>8.3f}")
+    print(f"(compute_all is {elapsed / single_pass:.2f}x faster, same results: {separate == single}.)")
+
+
+def bench_records(file_path: str) -> None:
+    """
+    Compares the time to parse and the memory kept per entry by 'main.parse' (pydantic and dictionaries) and by
+    'records.parse_records' (with and without validation).
+
+    :param file_path: File to parse.
+    :return: None
+    """
+
+    parsers: dict = {
+        "pydantic": parse,
+        "records": parse_records,
+        "validated": lambda path: parse_records(path, validate=True)
+    }
+
+    print(f"{'storage':>10} | {'entries':>9} | {'seconds':>8} | {'bytes/entry':>11}")
+
+    for name, parser in parsers.items():
+
+        start: float = time.perf_counter()
+        data = parser(file_path)
+        elapsed: float = time.perf_counter() - start
+
+        del data
+
+        # Measured apart, tracing every allocation slows the parse down.
+        tracemalloc.start()
+        data = parser(file_path)
+        kept: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        print(f"{name:>10} | {len(data.all):>9} | {elapsed:>8.3f} | {kept / len(data.all):>11.0f}")
+
+        del data
+
+
+def bench_stream(file_path: str) -> None:
+    """
+    Compares computing every distribution by parsing into a Storage first ('parse' and 'compute_all') and straight
+    from the memory-mapped file ('stream.compute_streaming'), in time and peak traced memory.
+
+    :param file_path: File to parse.
+    :return: None
+    """
+
+    approaches: dict = {
+        "storage": lambda: parse(file_path).compute_all(),
+        "streaming": lambda: compute_streaming(file_path)
+    }
+
+    print(f"{'approach':>10} | {'seconds':>8} | {'peak MiB':>8}")
+
+    results: list[dict] = []
+
+    for name, approach in approaches.items():
+
+        start: float = time.perf_counter()
+        results.append(approach())
+        elapsed: float = time.perf_counter() - start
+
+        # Measured apart, tracing every allocation slows it down.
+        tracemalloc.start()
+        approach()
+        peak: int = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"{name:>10} | {elapsed:>8.3f} | {peak / (1 << 20):>8.1f}")
+
+    print(f"(Same results: {results[0] == results[1]}.)")
+
+
+def bench_parallel(file_path: str, workers: list[int]) -> None:
+    """
+    Times 'parallel.compute_parallel' with different amounts of workers, against the serial
+    'stream.compute_streaming', and checks every result is identical to the serial one (same counts, and the same
+    order of the keys and of the ties of the top five names).
+
+    :param file_path: File to parse.
+    :param workers: Amounts of workers to try.
+    :return: None
+    """
+
+    start: float = time.perf_counter()
+    serial: str = json.dumps(compute_streaming(file_path))
+    baseline: float = time.perf_counter() - start
+
+    print(f"{'workers':>8} | {'seconds':>8} | {'speedup':>8} | {'identical':>9}")
+    print(f"{'serial':>8} | {baseline:>8.3f} | {1:>7.2f}x | {'-':>9}")
+
+    identical: bool = True
+
+    for amount in workers:
+
+        start = time.perf_counter()
+        result: str = json.dumps(compute_parallel(file_path, amount))
+        elapsed: float = time.perf_counter() - start
+
+        identical = identical and result == serial
+
+        print(f"{amount:>8} | {elapsed:>8.3f} | {baseline / elapsed:>7.2f}x | {str(result == serial):>9}")
+
+    print(f"(Machine has {os.cpu_count()} CPUs.)")
+
+    if not identical:
+        raise Exception("The parallel results differ from the serial ones.")
+
+
+def bench_sketch(file_path: str, epsilons: list[float]) -> None:
+    """
+    Compares the top five names of each century of the exact 'dist_by_names' (over a parsed Storage), of the exact
+    streaming counts and of 'sketch.SketchDistributions' (without the exact fallback) for different errors, in
+    time, peak traced memory and accuracy (share of the top fives, of names and of surnames, equal to the exact ones).
+
+    :param file_path: File to parse.
+    :param epsilons: Errors of the sketches to try.
+    :return: None
+    """
+
+    approaches: dict = {
+        "dist_by_names": lambda: parse(file_path).dist_by_names(),
+        "streaming": lambda: compute_streaming(file_path)["names"]
+    }
+
+    for epsilon in epsilons:
+        approaches[f"sketch {epsilon}"] = lambda epsilon=epsilon: count_matches(
+            iter_matches(file_path), distributions=SketchDistributions(epsilon)
+        )
+
+    print(f"{'approach':>14} | {'seconds':>8} | {'peak MiB':>8} | {'accuracy':>8} | {'guaranteed':>10}")
+
+    exact: dict = {}
+
+    for name, approach in approaches.items():
+
+        start: float = time.perf_counter()
+        result = approach()
+        elapsed: float = time.perf_counter() - start
+
+        guaranteed: str = "-"
+
+        if isinstance(result, SketchDistributions):
+            guaranteed = str(result.guaranteed())
+            result = result.results()["names"]
+
+        exact = exact or result
+
+        tops: list[tuple[str, int]] = [(kind, century) for kind in exact for century in exact[kind]]
+        accuracy: float = sum(result[kind].get(century) == exact[kind][century] for kind, century in tops) / len(tops)
+
+        # Measured apart, tracing every allocation slows it down.
+        tracemalloc.start()
+        approach()
+        peak: int = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"{name:>14} | {elapsed:>8.3f} | {peak / (1 << 20):>8.1f} | {accuracy:>8.1%} | {guaranteed:>10}")
+
+
+def main():
+
+    arguments = argparse.ArgumentParser(description="'processos.txt' benchmarks.")
+    commands = arguments.add_subparsers(dest="command", required=True)
+
+    dist = commands.add_parser("dist", help="The separate distributions against 'compute_all'.")
+    dist.add_argument("file", help="Path to 'processos.txt'.")
+    dist.add_argument("--copies", type=int, default=10, help="Times the file is replicated.")
+
+    records = commands.add_parser("records", help="Time and memory of the pydantic storage and of the records.")
+    records.add_argument("file", help="Path to 'processos.txt'.")
+    records.add_argument("--copies", type=int, default=10, help="Times the file is replicated.")
+
+    streaming = commands.add_parser("stream", help="Distributions from a Storage and from the memory-mapped file.")
+    streaming.add_argument("file", help="Path to 'processos.txt'.")
+    streaming.add_argument("--copies", type=int, default=10, help="Times the file is replicated.")
+
+    parallel = commands.add_parser("parallel", help="Scaling and determinism of the multi-process distributions.")
+    parallel.add_argument("file", help="Path to 'processos.txt'.")
+    parallel.add_argument("--copies", type=int, default=10, help="Times the file is replicated.")
+    parallel.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+
+    sketches = commands.add_parser("sketch", help="Accuracy and memory of the approximate top five names.")
+    sketches.add_argument("file", help="Path to 'processos.txt'.")
+    sketches.add_argument("--copies", type=int, default=10, help="Times the file is replicated.")
+    sketches.add_argument("--epsilons", type=float, nargs="+", default=[0.01, 0.001])
+
+    args = arguments.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        file_path: str = replicate(args.file, args.copies, directory)
+
+        if args.command == "dist":
+            bench_dist(file_path)
+
+        if args.command == "records":
+            bench_records(file_path)
+
+        if args.command == "stream":
+            bench_stream(file_path)
+
+        if args.command == "parallel":
+            bench_parallel(file_path, args.workers)
+
+        if args.command == "sketch":
+            bench_sketch(file_path, args.epsilons)
+
+
+if __name__ == '__main__':
+    SystemExit(main())
@@ -0,0 +1,64 @@
+"""
+Lets the tests of this folder run together with the ones of the other folders (e.g. 'python -m pytest' from the
+root of the repository). Every folder has its own 'main', 'parallel' and 'bench' modules, imported by name, so the
+ones of this folder are put in 'sys.modules' while its tests are collected and while they run (worker processes
+find the functions sent to them by the name of their module).
+"""
+
+import os
+import sys
+
+import pytest
+
+FOLDER: str = os.path.dirname(os.path.abspath(__file__))
+
+# Names of the modules that every folder has.
+SHARED_NAMES: tuple[str, ...] = ("main", "parallel", "bench")
+
+# Name -> module of this folder, once imported by its tests.
+MODULES: dict = {}
+
+
+def __is_local__(module) -> bool:
+    return os.path.dirname(os.path.abspath(getattr(module, "__file__", None) or "")) == FOLDER
+
+
+def use_folder() -> None:
+    """
+    Puts this folder first on the path and its shared modules (or none, if not imported yet) in 'sys.modules'.
+    :return: None
+    """
+
+    if FOLDER in sys.path:
+        sys.path.remove(FOLDER)
+
+    sys.path.insert(0, FOLDER)
+
+    for name in SHARED_NAMES:
+
+        if name in MODULES:
+            sys.modules[name] = MODULES[name]
+
+        elif name in sys.modules and not __is_local__(sys.modules[name]):
+            del sys.modules[name]
+
+
+def pytest_collectstart(collector) -> None:
+
+    # Called right before each test module of this folder is imported.
+    if isinstance(collector, pytest.Module) and os.path.dirname(str(collector.path)) == FOLDER:
+        use_folder()
+
+
+def pytest_collectreport(report) -> None:
+
+    # Called once each test module is imported, its shared modules are the ones of this folder.
+    for name in SHARED_NAMES:
+        if name in sys.modules and __is_local__(sys.modules[name]):
+            MODULES.setdefault(name, sys.modules[name])
+
+
+@pytest.fixture(autouse=True)
+def folder_modules() -> None:
+    use_folder()
+
@@ -0,0 +1,156 @@
+"""
+Streaming JSON export of the entries by folder and of the distributions.
+
+The output is written a folder (or a distribution) at a time, so the whole JSON text is never built in memory.
+With the standard 'json' module the output is exactly the same as `json.dumps` of the whole object (e.g. the same
+as `main.Storage.as_json`), with orjson (used when installed, unless told not to) it is the same JSON, compact and
+without escaping non-ASCII characters.
+Files whose name ends in '.gz' (or when asked for) are gzip-compressed.
+"""
+
+import gzip
+import json
+
+from functools import cache
+from typing import BinaryIO, Callable, Iterable, Optional
+
+from queries import Distributions, Queries
+
+
+@cache
+def load_orjson():
+    """
+    Imports orjson the first time it is needed.
+    :return: The orjson module, or None if it is not installed.
+    """
+
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    return orjson
+
+
+def get_encoder(use_orjson: Optional[bool] = None) -> tuple[Callable[[object], bytes], bytes, bytes]:
+    """
+    :param use_orjson: Use orjson, by default only if it is installed.
+    :return: Function that encodes an object into JSON, and the item and key separators that go with it.
+    """
+
+    orjson = load_orjson() if use_orjson is not False else None
+
+    if use_orjson and orjson is None:
+        raise Exception("orjson is not installed.")
+
+    if orjson is None:
+        return lambda obj: json.dumps(obj).encode(), b", ", b": "
+
+    # The distributions have integer keys (years, centuries), which orjson only accepts when told to.
+    return lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), b",", b":"
+
+
+def open_output(file_path: str, compress: Optional[bool] = None) -> BinaryIO:
+    """
+    :param file_path: Where to write.
+    :param compress: Compress with gzip, by default only if the name ends in '.gz'.
+    :return: The file, open for writing bytes.
+    """
+
+    if compress or (compress is None and file_path.endswith(".gz")):
+        return gzip.open(file_path, "wb")
+
+    return open(file_path, "wb")
+
+
+def write_object(items: Iterable[tuple[object, object]], output: BinaryIO, use_orjson: Optional[bool] = None) -> int:
+    """
+    Writes a JSON object one member at a time, each value is encoded (and can be produced) right before it is
+    written.
+
+    :param items: Iterable over the keys (converted to strings, like 'json' does) and values of the object.
+    :param output: File open for writing bytes.
+    :param use_orjson: See `get_encoder`.
+    :return: Amount of members written.
+    """
+
+    encode, item_separator, key_separator = get_encoder(use_orjson)
+    written: int = 0
+
+    output.write(b"{")
+
+    for key, value in items:
+
+        if written:
+            output.write(item_separator)
+
+        output.write(encode(str(key)))
+        output.write(key_separator)
+        output.write(encode(value))
+
+        written += 1
+
+    output.write(b"}")
+
+    return written
+
+
+def write_folders(storage: Queries, output: BinaryIO, use_orjson: Optional[bool] = None) -> int:
+    """
+    Writes the `by_folder` attribute of a storage, the same JSON as `as_json`, a folder at a time.
+
+    :param storage: A `main.Storage` or `records.RecordStorage`.
+    :param output: File open for writing bytes.
+    :param use_orjson: See `get_encoder`.
+    :return: Amount of folders written.
+    """
+
+    return write_object(storage.iter_folders(), output, use_orjson)
+
+
+def write_distributions(distributions: Iterable[tuple[str, dict]], output: BinaryIO,
+                        use_orjson: Optional[bool] = None) -> int:
+    """
+    Writes the distributions, each one as soon as it is produced.
+
+    :param distributions: Iterable over the name and result of each distribution, e.g.
+    `queries.Distributions.iter_results`.
+    :param output: File open for writing bytes.
+    :param use_orjson: See `get_encoder`.
+    :return: Amount of distributions written.
+    """
+
+    return write_object(distributions, output, use_orjson)
+
+
+def export(storage: Queries, file_path: str, compress: Optional[bool] = None,
+           use_orjson: Optional[bool] = None) -> int:
+    """
+    Writes the entries by folder into a file.
+
+    :param storage: A `main.Storage` or `records.RecordStorage`.
+    :param file_path: Where to write, see `open_output`.
+    :param compress: See `open_output`.
+    :param use_orjson: See `get_encoder`.
+    :return: Amount of folders written.
+    """
+
+    with open_output(file_path, compress) as output:
+        return write_folders(storage, output, use_orjson)
+
+
+def export_distributions(distributions: Distributions, file_path: str, compress: Optional[bool] = None,
+                         use_orjson: Optional[bool] = None) -> int:
+    """
+    Writes every distribution into a file, e.g. the result of `stream.count_matches` or `parallel.count_parallel`,
+    each one built right before it is written.
+
+    :param distributions: The distributions.
+    :param file_path: Where to write, see `open_output`.
+    :param compress: See `open_output`.
+    :param use_orjson: See `get_encoder`.
+    :return: Amount of distributions written.
+    """
+
+    with open_output(file_path, compress) as output:
+        return write_distributions(distributions.iter_results(), output, use_orjson)
@@ -0,0 +1,102 @@
+"""
+Multi-process computation of the distributions of 'processos.txt'.
+
+The file is split into byte ranges that start and end on a line boundary, every process counts the entries of a
+range into its own `queries.Distributions` and the partial counts are merged in file order, which gives exactly the
+same results (ties of the top five names included) as a single process.
+"""
+
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from queries import Distributions
+from stream import BATCH_SIZE, count_matches, iter_matches
+
+
+def split_file(file_path: str, parts: int) -> list[tuple[int, int]]:
+    """
+    Splits the file into byte ranges that start and end on a line boundary.
+
+    :param file_path: File path to the file to be split.
+    :param parts: Amount of ranges to split the file into.
+    :return: List with the (start, end) byte offsets of each range, in file order.
+    """
+
+    size: int = os.path.getsize(file_path)
+    bounds: list[int] = [0]
+
+    with open(file_path, "rb") as file:
+
+        for part in range(1, parts):
+
+            file.seek(max(size * part // parts, bounds[-1]))
+
+            # A range that starts exactly at the start of a line keeps it.
+            if file.tell() > 0:
+                file.seek(file.tell() - 1)
+                file.readline()
+
+            bounds.append(file.tell())
+
+    bounds.append(size)
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def count_part(file_path: str, start: int, end: int, batch_size: int = BATCH_SIZE) -> Distributions:
+    """
+    Counts the entries of a range of the file. Runs on a worker process.
+
+    :param file_path: File path to the file to be parsed.
+    :param start: Byte offset of the first line of the range.
+    :param end: Byte offset where the range ends.
+    :param batch_size: Entries counted at a time.
+    :return: Distributions of the entries of the range.
+    """
+
+    return count_matches(iter_matches(file_path, start, end), batch_size)
+
+
+def count_parallel(file_path: str, workers: Optional[int] = None, batch_size: int = BATCH_SIZE) -> Distributions:
+    """
+    Counts the entries of the file using a pool of processes, each one a range of its lines.
+
+    :param file_path: File path to the file to be parsed.
+    :param workers: Amount of processes to use, by default the number of CPUs.
+    :param batch_size: Entries counted at a time by each process.
+    :return: Distributions of every entry, the partial counts merged in file order (e.g. for
+    `export.export_distributions`).
+    """
+
+    if not os.path.isfile(file_path):
+        raise Exception(f"{file_path} is not an existing file.")
+
+    workers = workers or os.cpu_count() or 1
+    distributions: Distributions = Distributions()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        partials = [
+            executor.submit(count_part, file_path, start, end, batch_size)
+            for start, end in split_file(file_path, workers)
+        ]
+
+        for partial in partials:
+            distributions.merge(partial.result())
+
+    return distributions
+
+
+def compute_parallel(file_path: str, workers: Optional[int] = None, batch_size: int = BATCH_SIZE) -> dict[str, dict]:
+    """
+    Same as `main.Storage.compute_all` (and `stream.compute_streaming`) using a pool of processes.
+
+    :param file_path: File path to the file to be parsed.
+    :param workers: Amount of processes to use, by default the number of CPUs.
+    :param batch_size: Entries counted at a time by each process.
+    :return: Dictionary with every distribution, see `queries.Distributions.results`.
+    """
+
+    return count_parallel(file_path, workers, batch_size).results()
@@ -0,0 +1,472 @@
+"""
+Everything shared by the storages of 'processos.txt' that does not need pydantic: the parser expression, the
+entries, their indexes and queries, and the distributions. Importing it (e.g. from `records`, `stream` or
+`parallel`) does not import pydantic, only `main.Storage` does.
+"""
+
+import re
+import json
+
+from typing import Iterator, Optional
+from typing_extensions import TypedDict
+from collections import Counter, defaultdict
+from heapq import merge, nlargest
+from operator import itemgetter
+
+# A line of 'processos.txt': folder::date::name::father::mother::observations::
+PARSER_EXP: re.Pattern = re.compile(
+    r'(\d+)::(\d{4}\-\d{2}\-\d{2})::([\w\d\s,.]+)::([\w\d\s,.]+)?::([\w\d\s,.]+)?::([\w\d\s,.]+)?::'
+)
+
+# The family relationship in the observations, e.g. 'Manuel Pereira Silva,Irmao. Proc.27706.'
+RELATIONSHIP_EXP: re.Pattern = re.compile(r'\,([\w\s]+)\. Proc')
+
+
+class Entry(TypedDict):
+
+    """
+    Attributes:
+        folder (int): Identifies which folder the process belongs to.
+        date (str): The date of the process as a string formatted like 'YYYY-mm-dd'.
+        name (str): The name of the victim.
+        father (Optional[str]): The name of the victims father.
+        mother (Optional[str]): The name of the victims mother.
+        obs (str): String containing various observations, the family relationship status or process identification.
+    """
+
+    folder: int
+    date: str
+    name: str
+    father: Optional[str]
+    mother: Optional[str]
+    obs: Optional[str]
+
+
+class Indexes:
+
+    """
+    Secondary indexes of the entries of a storage, each one maps a key to the positions (in its `all`) of the
+    entries with that key, in increasing order.
+
+    Attributes:
+        by_year (dict[int, list[int]]): Positions by the year of the process.
+        by_century (dict[int, list[int]]): Positions by the century of the process.
+        by_first_name (dict[str, dict[int, list[int]]]): Positions by the first name of the victim and century.
+        by_surname (dict[str, dict[int, list[int]]]): Positions by the surname of the victim and century.
+        by_father (dict[str, list[int]]): Positions by the name of the father.
+        by_mother (dict[str, list[int]]): Positions by the name of the mother.
+    """
+
+    def __init__(self):
+        self.size: int = 0
+
+        self.by_year: dict[int, list[int]] = defaultdict(list)
+        self.by_century: dict[int, list[int]] = defaultdict(list)
+        self.by_first_name: dict[str, dict[int, list[int]]] = defaultdict(lambda: defaultdict(list))
+        self.by_surname: dict[str, dict[int, list[int]]] = defaultdict(lambda: defaultdict(list))
+        self.by_father: dict[str, list[int]] = defaultdict(list)
+        self.by_mother: dict[str, list[int]] = defaultdict(list)
+
+    def add(self, year: int, name: str, father: Optional[str], mother: Optional[str]) -> None:
+        """
+        Index the next entry of the storage, at position 'size' of its `all`.
+        :param year: Year of the process.
+        :param name: Name of the victim.
+        :param father: Name of the father.
+        :param mother: Name of the mother.
+        :return: None
+        """
+
+        position: int = self.size
+        century: int = get_century(year)
+        split_name: list[str] = name.split(" ")
+
+        self.by_year[year].append(position)
+        self.by_century[century].append(position)
+        self.by_first_name[split_name[0]][century].append(position)
+        self.by_surname[split_name[-1]][century].append(position)
+
+        if father:
+            self.by_father[father].append(position)
+
+        if mother:
+            self.by_mother[mother].append(position)
+
+        self.size += 1
+
+
+class Queries:
+
+    """
+    Queries over the entries of a storage, shared by `main.Storage` and `records.RecordStorage`. The storage needs the
+    `all` and `by_folder` attributes, and `_indexes` to keep the indexes.
+    """
+
+    @property
+    def indexes(self) -> Indexes:
+        """
+        Indexes of the entries, see `build_indexes`.
+        :return: The indexes.
+        """
+
+        return self.build_indexes()
+
+    def build_indexes(self) -> Indexes:
+        """
+        Index the entries stored since the last call (every entry the first time).
+        :return: The indexes.
+        """
+
+        if self._indexes is None or self._indexes.size > len(self.all):
+            self._indexes = Indexes()
+
+        for entry in self.all[self._indexes.size:]:
+            self._indexes.add(*self.index_fields(entry))
+
+        return self._indexes
+
+    def add(self, entry: Entry) -> None:
+        """
+        Store an entry, it is indexed by the next use of `indexes` (or `build_indexes`).
+        :param entry: The entry.
+        :return: None
+        """
+
+        if entry["folder"] not in self.by_folder:
+            self.by_folder[entry["folder"]] = []
+
+        self.by_folder[entry["folder"]].append(entry)
+        self.all.append(entry)
+
+    @staticmethod
+    def index_fields(entry: Entry) -> tuple[int, str, Optional[str], Optional[str]]:
+        """
+        :param entry: An entry of the storage.
+        :return: The year, name, father and mother of the entry, see `Indexes.add`.
+        """
+
+        return int(entry["date"][:4]), entry["name"], entry["father"], entry["mother"]
+
+    def entries(self, positions: list[int]) -> list[Entry]:
+        """
+        :param positions: Positions of entries, as kept by the indexes.
+        :return: The entries at those positions.
+        """
+
+        return [self.all[position] for position in positions]
+
+    def by_year(self, year: int) -> list[Entry]:
+        """
+        :param year: The year.
+        :return: Every process of that year.
+        """
+
+        return self.entries(self.indexes.by_year.get(year, []))
+
+    def by_century(self, century: int) -> list[Entry]:
+        """
+        :param century: The century.
+        :return: Every process of that century.
+        """
+
+        return self.entries(self.indexes.by_century.get(century, []))
+
+    def by_first_name(self, name: str, century: Optional[int] = None) -> list[Entry]:
+        """
+        :param name: First name of the victim.
+        :param century: Only processes of this century, or of every century if None.
+        :return: Every process of a victim with that first name.
+        """
+
+        return self.entries(self.__by_name__(self.indexes.by_first_name, name, century))
+
+    def by_surname(self, surname: str, century: Optional[int] = None) -> list[Entry]:
+        """
+        :param surname: Surname of the victim.
+        :param century: Only processes of this century, or of every century if None.
+        :return: Every process of a victim with that surname.
+        """
+
+        return self.entries(self.__by_name__(self.indexes.by_surname, surname, century))
+
+    def children_of(self, father: Optional[str] = None, mother: Optional[str] = None) -> list[Entry]:
+        """
+        :param father: Full name of the father.
+        :param mother: Full name of the mother.
+        :return: Every process of a child of that father, mother or, if both are given, of both.
+        """
+
+        if father is None and mother is None:
+            raise Exception("A father or a mother is needed.")
+
+        if mother is None:
+            return self.entries(self.indexes.by_father.get(father, []))
+
+        if father is None:
+            return self.entries(self.indexes.by_mother.get(mother, []))
+
+        of_mother: set[int] = set(self.indexes.by_mother.get(mother, []))
+
+        return self.entries([position for position in self.indexes.by_father.get(father, []) if position in of_mother])
+
+    @staticmethod
+    def __by_name__(index: dict[str, dict[int, list[int]]], name: str, century: Optional[int]) -> list[int]:
+
+        if name not in index:
+            return []
+
+        if century is not None:
+            return index[name].get(century, [])
+
+        return list(merge(*index[name].values()))
+
+    def dist_by_year(self) -> dict[int, int]:
+        """
+        Distribution of processes by its year.
+        :return: The distribution as a dictionary.
+        """
+
+        return {year: len(positions) for year, positions in self.indexes.by_year.items()}
+
+    def dist_by_names(self) -> dict[str, dict[int, list[str]]]:
+        """
+        Distribution of the victims names over each century.
+        :return: The distribution as a dictionary.
+        """
+
+        result: dict[str, dict[int, list[str]]] = {
+            "names": {},
+            "surnames": {}
+        }
+
+        for entry in self.all:
+
+            entry_century: int = get_century(int(entry["date"].split("-", 1)[0]))
+
+            if entry_century not in result["names"] or entry_century not in result["surnames"]:
+                result["names"][entry_century] = []
+                result["surnames"][entry_century] = []
+
+            split_name: list[str] = entry["name"].split(" ")
+
+            result["names"][entry_century].append(split_name[0])
+            result["surnames"][entry_century].append(split_name[-1])
+
+        for century in result["names"]:
+            result["names"][century] = count_and_reduce(result["names"][century])
+
+        for century in result["surnames"]:
+            result["surnames"][century] = count_and_reduce(result["surnames"][century])
+
+        return result
+
+    def dist_by_relationship(self) -> dict[str, int]:
+        """
+        Distribution of the family relationships (Sister, Brother, Nephew, etc.).
+        :return: The distribuiton as a dictionary.
+        """
+
+        result: dict[str, int] = {}
+
+        for entry in self.all:
+
+            if entry["obs"] and (match := RELATIONSHIP_EXP.search(entry["obs"])):
+
+                rel = match[1]
+                if rel not in result:
+                    result[rel] = 0
+
+                result[rel] += 1
+
+        return result
+
+    def compute_all(self) -> dict[str, dict]:
+        """
+        Every distribution in a single pass over the entries, see `Distributions`. The pass only gathers the year,
+        the name (into the list of its century, found once per year) and the observations of each entry, the
+        gathered lists are then counted at once by `Distributions.update_grouped`.
+        :return: Dictionary with the results of `dist_by_year` ('year'), `dist_by_names` ('names') and
+        `dist_by_relationship` ('relations').
+        """
+
+        years: list[int] = []
+        observations: list[str] = []
+        by_century: dict[int, list[str]] = defaultdict(list)
+        group_of: dict[int, list[str]] = {}
+
+        for entry in self.all:
+
+            year: int = int(entry["date"][:4])
+            years.append(year)
+
+            if (group := group_of.get(year)) is None:
+                group = group_of[year] = by_century[get_century(year)]
+
+            group.append(entry["name"])
+
+            if entry["obs"]:
+                observations.append(entry["obs"])
+
+        distributions: Distributions = Distributions()
+        distributions.update_grouped(years, by_century, observations)
+
+        return distributions.results()
+
+    def iter_folders(self) -> Iterator[tuple[int, list[Entry]]]:
+        """
+        :return: Iterator over the number and the entries of each folder, see `export.write_folders`.
+        """
+
+        return iter(self.by_folder.items())
+
+    def as_json(self):
+        """
+        :return: JSON object of the `by_folder` attribute.
+        """
+        return json.dumps(self.by_folder)
+
+
+class Distributions:
+
+    """
+    Accumulates every distribution at once, so they can be computed in a single pass (and by parts, see `merge`).
+    Entries are counted in batches with `Counter.update`, instead of one at a time.
+
+    Attributes:
+        years (Counter): Processes by year.
+        names (dict[int, Counter]): First names of the victims by century.
+        surnames (dict[int, Counter]): Surnames of the victims by century.
+        relations (Counter): Family relationships.
+    """
+
+    def __init__(self):
+        self.years: Counter = Counter()
+        self.names: dict[int, Counter] = defaultdict(Counter)
+        self.surnames: dict[int, Counter] = defaultdict(Counter)
+        self.relations: Counter = Counter()
+
+    def add(self, year: int, name: str, obs: Optional[str]) -> None:
+        """
+        Count an entry.
+        :param year: Year of the process.
+        :param name: Name of the victim.
+        :param obs: Observations of the process.
+        :return: None
+        """
+
+        self.update([year], [name], [obs])
+
+    def update(self, years: list[int], names: list[str], observations: list[Optional[str]]) -> None:
+        """
+        Count a batch of entries.
+        :param years: Year of each process.
+        :param names: Name of the victim of each process.
+        :param observations: Observations of each process.
+        :return: None
+        """
+
+        century_of: dict[int, int] = {year: get_century(year) for year in set(years)}
+        by_century: dict[int, list[str]] = defaultdict(list)
+
+        for century, name in zip(map(century_of.__getitem__, years), names):
+            by_century[century].append(name)
+
+        self.update_grouped(years, by_century, observations)
+
+    def update_grouped(self, years: list[int], by_century: dict[int, list[str]],
+                       observations: list[Optional[str]]) -> None:
+        """
+        Same as `update`, with the names already grouped by century.
+        :param years: Year of each process.
+        :param by_century: Names of the victims of each century, in order.
+        :param observations: Observations of each process.
+        :return: None
+        """
+
+        self.years.update(years)
+
+        # Same as the first and last element of 'name.split(" ")', without building a list per name.
+        for century, group in by_century.items():
+            self.names[century].update([name.partition(" ")[0] for name in group])
+            self.surnames[century].update([name.rpartition(" ")[2] for name in group])
+
+        self.relations.update(
+            map(itemgetter(1), filter(None, map(RELATIONSHIP_EXP.search, filter(None, observations))))
+        )
+
+    def merge(self, other: "Distributions") -> "Distributions":
+        """
+        Add the counts of entries that come after the ones already counted.
+        :param other: Distributions of those entries.
+        :return: This object.
+        """
+
+        self.years.update(other.years)
+        self.relations.update(other.relations)
+
+        for century, names in other.names.items():
+            self.names[century].update(names)
+
+        for century, surnames in other.surnames.items():
+            self.surnames[century].update(surnames)
+
+        return self
+
+    def results(self) -> dict[str, dict]:
+        """
+        :return: Dictionary with the same results as `Queries.dist_by_year` ('year'), `Queries.dist_by_names`
+        ('names') and `Queries.dist_by_relationship` ('relations').
+        """
+
+        return dict(self.iter_results())
+
+    def iter_results(self) -> Iterator[tuple[str, dict]]:
+        """
+        Same as `results`, each distribution is only built when it is asked for.
+        :return: Iterator over the name and the result of each distribution.
+        """
+
+        yield "year", dict(self.years)
+
+        yield "names", {
+            "names": {century: count_and_reduce(names) for century, names in self.names.items()},
+            "surnames": {century: count_and_reduce(surnames) for century, surnames in self.surnames.items()}
+        }
+
+        yield "relations", dict(self.relations)
+
+
+def count_and_reduce(name_list: list[str]) -> list[str]:
+    """
+    From a list only containing names, get the five most used ones.
+
+    Example:
+        l = ["name_c", "name_a", "name_b", "name_a"]
+        l = [("name_c", 1), ("name_a", 2), ("name_b", 1)]
+        l = ["name_a", "name_c", "name_b"]
+
+    :param name_list: The list containing the names to be counted and ranked, or a Counter with them already counted.
+    :return: List containign the top five most used names.
+    """
+
+    counted_names: Counter = Counter(name_list)
+
+    # Same as sorting by count and keeping the first five (ties stay in order of appearance), without the sort.
+    return [pair[0] for pair in nlargest(5, counted_names.items(), key=itemgetter(1))]
+
+
+def get_century(year: int) -> int:
+    """
+    Retrieve the century from a year.
+    :param year: The year (lol?).
+    :return: The century (lol!?).
+    """
+
+    if year <= 100:
+        return 1
+
+    elif year % 100 == 0:
+        return year // 100
+
+    else:
+        return year // 100 + 1
@@ -0,0 +1,208 @@
+"""
+Compact storage of the processes of 'processos.txt', without pydantic.
+
+Each process is a `Record`, a class with `__slots__` (no dictionary per object), with the date kept as integers and
+the names interned, so repeated names (very common among fathers and mothers) are stored once. Pydantic validation
+is still available, when asked for, at the boundary (see `RecordStorage.validated`).
+"""
+
+import json
+import re
+import sys
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from queries import PARSER_EXP, Distributions, Entry, Indexes, Queries, get_century
+
+if TYPE_CHECKING:
+    from main import Storage
+
+
+class Record:
+
+    """
+    Attributes:
+        folder (int): Identifies which folder the process belongs to.
+        year (int): Year of the process.
+        month (int): Month of the process.
+        day (int): Day of the process.
+        name (str): The name of the victim.
+        father (Optional[str]): The name of the victims father.
+        mother (Optional[str]): The name of the victims mother.
+        obs (Optional[str]): Various observations, the family relationship status or process identification.
+    """
+
+    __slots__ = ("folder", "year", "month", "day", "name", "father", "mother", "obs")
+
+    def __init__(self, folder: int, year: int, month: int, day: int, name: str,
+                 father: Optional[str], mother: Optional[str], obs: Optional[str]):
+        """
+        Class constructor.
+        """
+
+        self.folder = folder
+        self.year = year
+        self.month = month
+        self.day = day
+        self.name = sys.intern(name)
+        self.father = sys.intern(father) if father else father
+        self.mother = sys.intern(mother) if mother else mother
+        self.obs = obs
+
+    @classmethod
+    def from_match(cls, match: re.Match) -> "Record":
+        """
+        :param match: Match of `queries.PARSER_EXP`.
+        :return: The record.
+        """
+
+        return cls(
+            int(match[1]), int(match[2][:4]), int(match[2][5:7]), int(match[2][8:10]),
+            match[3], match[4], match[5], match[6]
+        )
+
+    @property
+    def date(self) -> str:
+        return f"{self.year:04d}-{self.month:02d}-{self.day:02d}"
+
+    def __getitem__(self, key: str):
+        """
+        Read the record like an `Entry`, e.g. record["date"].
+        """
+
+        if key not in Entry.__annotations__:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def as_entry(self) -> Entry:
+        """
+        :return: The record as an `Entry`.
+        """
+
+        return Entry(
+            folder=self.folder, date=self.date, name=self.name,
+            father=self.father, mother=self.mother, obs=self.obs
+        )
+
+
+class RecordStorage(Queries):
+
+    """
+    Same as `main.Storage` with `Record` objects instead of `Entry` dictionaries, and without validation.
+
+    Attributes:
+        all (list[Record]): List of every record, unordered.
+        by_folder (dict[int, list[Record]): Dictionary containing every record by the folder number.
+    """
+
+    def __init__(self, all: Optional[list[Record]] = None, by_folder: Optional[dict[int, list[Record]]] = None):
+        """
+        Class constructor.
+        """
+
+        self.all: list[Record] = all if all is not None else []
+        self.by_folder: dict[int, list[Record]] = by_folder if by_folder is not None else {}
+        self._indexes: Optional[Indexes] = None
+
+    def add(self, record: Record) -> None:
+        """
+        Store a record, it is indexed by the next use of `indexes` (or `build_indexes`).
+        :param record: The record.
+        :return: None
+        """
+
+        if record.folder not in self.by_folder:
+            self.by_folder[record.folder] = []
+
+        self.by_folder[record.folder].append(record)
+        self.all.append(record)
+
+    @staticmethod
+    def index_fields(record: Record) -> tuple[int, str, Optional[str], Optional[str]]:
+        return record.year, record.name, record.father, record.mother
+
+    def compute_all(self) -> dict[str, dict]:
+        """
+        Same as `Queries.compute_all`, reading the year of the records directly.
+        """
+
+        years: list[int] = []
+        observations: list[str] = []
+        by_century: dict[int, list[str]] = defaultdict(list)
+        group_of: dict[int, list[str]] = {}
+
+        for record in self.all:
+
+            years.append(record.year)
+
+            if (group := group_of.get(record.year)) is None:
+                group = group_of[record.year] = by_century[get_century(record.year)]
+
+            group.append(record.name)
+
+            if record.obs:
+                observations.append(record.obs)
+
+        distributions: Distributions = Distributions()
+        distributions.update_grouped(years, by_century, observations)
+
+        return distributions.results()
+
+    def iter_folders(self) -> Iterator[tuple[int, list[Entry]]]:
+        """
+        Same as `Queries.iter_folders`, the records of each folder are only converted when it is reached.
+        """
+
+        for folder, records in self.by_folder.items():
+            yield folder, [record.as_entry() for record in records]
+
+    def as_entries(self) -> dict[int, list[Entry]]:
+        """
+        :return: The `by_folder` attribute with every record as an `Entry`.
+        """
+
+        return {folder: [record.as_entry() for record in records] for folder, records in self.by_folder.items()}
+
+    def as_json(self):
+        """
+        :return: JSON object of the `by_folder` attribute.
+        """
+
+        return json.dumps(self.as_entries())
+
+    def validated(self) -> "Storage":
+        """
+        Check the records with pydantic, at the boundary with code that expects a validated `main.Storage`.
+        :return: The records as a `main.Storage`.
+        """
+
+        # Imported here, so only validating imports pydantic.
+        from main import Storage
+
+        return Storage(all=[record.as_entry() for record in self.all], by_folder=self.as_entries())
+
+
+def parse_records(file_path: str, validate: bool = False) -> RecordStorage:
+    """
+    Same as `main.parse`, storing `Record` objects.
+    :param file_path: File path to the file to be parsed.
+    :param validate: Also check the records with pydantic (see `RecordStorage.validated`).
+    :return: RecordStorage object with the read data.
+    """
+
+    result: RecordStorage = RecordStorage()
+
+    with open(file_path, "r") as file:
+        for line in file:
+            if match := PARSER_EXP.match(line):
+                result.add(Record.from_match(match))
+
+    if validate:
+        result.validated()
+
+    # Built once, here, instead of by the first query.
+    result.build_indexes()
+
+    return result
@@ -0,0 +1,163 @@
+"""
+Approximate top five names of each century with bounded memory.
+
+Instead of a Counter with every name of a century, each century keeps a Misra-Gries summary of at most 'capacity'
+counters. A name is counted at most 'error' times less than it really was, where 'error' is never more than
+'total / (capacity + 1)', so asking for a relative error 'epsilon' gives a capacity of '1 / epsilon' counters.
+While a century has no more distinct names than counters, its counts (and so its top five) are exact. When they are
+not, `SketchDistributions.guaranteed` tells whether the top five are still certainly right, and `compute_sketched`
+falls back to the exact counting otherwise.
+"""
+
+import math
+
+from collections import Counter, defaultdict
+from heapq import nlargest
+from typing import Iterable, Iterator, Union
+
+from queries import Distributions, count_and_reduce
+from stream import BATCH_SIZE, compute_streaming, count_matches, iter_matches
+
+
+class MisraGries:
+
+    """
+    Attributes:
+        capacity (int): Maximum amount of counters.
+        counts (dict[str, int]): Counted items, each one counted at most 'error' times less than it appeared.
+        total (int): Amount of items seen.
+        error (int): How much every count may be below the real one.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Class constructor.
+        :param capacity: Maximum amount of counters.
+        """
+
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        self.total: int = 0
+        self.error: int = 0
+
+    def update(self, items: Union[Iterable[str], "MisraGries"]) -> None:
+        """
+        Count a batch of items, or add the counts of another summary (of items that came after these).
+        :param items: The items, or the other summary.
+        :return: None
+        """
+
+        if isinstance(items, MisraGries):
+            counted, total, error = Counter(items.counts), items.total, items.error
+        else:
+            counted = Counter(items)
+            total, error = sum(counted.values()), 0
+
+        merged: Counter = Counter(self.counts)
+        merged.update(counted)
+
+        self.total += total
+        self.error += error
+
+        if len(merged) > self.capacity:
+
+            # Every counter goes down by the count of the first one that does not fit, and only the positive stay.
+            cut: int = nlargest(self.capacity + 1, merged.values())[-1]
+
+            merged = Counter({item: count - cut for item, count in merged.items() if count > cut})
+            self.error += cut
+
+        self.counts = dict(merged)
+
+    @property
+    def exact(self) -> bool:
+        return self.error == 0
+
+    def guaranteed(self, k: int = 5) -> bool:
+        """
+        :param k: Amount of most counted items.
+        :return: Whether the k most counted items, in order, are certainly the same as with exact counts.
+        """
+
+        if self.exact:
+            return True
+
+        ranked: list[int] = sorted(self.counts.values(), reverse=True)[:k + 1]
+
+        if len(ranked) < k:
+            return False
+
+        # An item not counted appeared at most 'error' times.
+        ranked.append(0)
+
+        return all(ranked[position] > ranked[position + 1] + self.error for position in range(k))
+
+
+class SketchDistributions(Distributions):
+
+    """
+    Same as `queries.Distributions`, with a `MisraGries` summary instead of a Counter for the names and surnames of
+    each century. The years and relationships are still counted exactly, there are few of them.
+    """
+
+    def __init__(self, epsilon: float = 0.001):
+        """
+        Class constructor.
+        :param epsilon: Maximum error of the counts of the names, as a fraction of the names of the century.
+        """
+
+        super().__init__()
+
+        self.capacity: int = math.ceil(1 / epsilon)
+
+        self.names: dict[int, MisraGries] = defaultdict(lambda: MisraGries(self.capacity))
+        self.surnames: dict[int, MisraGries] = defaultdict(lambda: MisraGries(self.capacity))
+
+    @property
+    def exact(self) -> bool:
+        """
+        :return: Whether every count is exact.
+        """
+
+        return all(sketch.exact for sketch in [*self.names.values(), *self.surnames.values()])
+
+    def guaranteed(self, k: int = 5) -> bool:
+        """
+        :param k: Amount of most used names.
+        :return: Whether the k most used names of every century are certainly the same as with exact counts.
+        """
+
+        return all(sketch.guaranteed(k) for sketch in [*self.names.values(), *self.surnames.values()])
+
+    def iter_results(self) -> Iterator[tuple[str, dict]]:
+
+        yield "year", dict(self.years)
+
+        yield "names", {
+            "names": {century: count_and_reduce(sketch.counts) for century, sketch in self.names.items()},
+            "surnames": {century: count_and_reduce(sketch.counts) for century, sketch in self.surnames.items()}
+        }
+
+        yield "relations", dict(self.relations)
+
+
+def compute_sketched(file_path: str, epsilon: float = 0.001, exact_fallback: bool = True,
+                     batch_size: int = BATCH_SIZE) -> dict[str, dict]:
+    """
+    Same as `stream.compute_streaming`, with the names counted by `SketchDistributions`.
+
+    :param file_path: File path to the file to be parsed.
+    :param epsilon: Maximum error of the counts of the names, see `SketchDistributions`.
+    :param exact_fallback: Count again, exactly, if the top five names are not certainly right.
+    :param batch_size: Entries counted at a time.
+    :return: Dictionary with every distribution, see `queries.Distributions.results`.
+    """
+
+    distributions: SketchDistributions = count_matches(
+        iter_matches(file_path), batch_size, SketchDistributions(epsilon)
+    )
+
+    if exact_fallback and not distributions.guaranteed():
+        return compute_streaming(file_path, batch_size)
+
+    return distributions.results()
@@ -0,0 +1,106 @@
+"""
+Streaming parser of 'processos.txt'.
+
+The file is memory-mapped and a single compiled bytes expression finds every entry over the whole buffer, so there
+is no reading line by line nor decoding of the whole file. Only the fields that are used are decoded: the
+distributions (see `compute_streaming`) never decode the folder, the parents nor the date (the year is read from
+the bytes), and nothing is kept besides the counters.
+"""
+
+import mmap
+import os
+import re
+
+from itertools import islice
+from typing import Iterator, Optional
+
+from queries import PARSER_EXP, Distributions, Entry
+
+# Same as `queries.PARSER_EXP` over the bytes of the file, anchored at the start of each line. The fields accept
+# whitespace other than a new line, so a match never spans two lines, and any non-ASCII byte: the lines with one
+# are checked again, decoded, against `queries.PARSER_EXP` (see `iter_matches`), which only accepts letters.
+ENTRY_EXP: re.Pattern = re.compile(
+    rb'^(\d+)::(\d{4}\-\d{2}\-\d{2})::([\w,.\x80-\xff \t\r\f\v\x1c-\x1f]+)::'
+    rb'([\w,.\x80-\xff \t\r\f\v\x1c-\x1f]+)?::([\w,.\x80-\xff \t\r\f\v\x1c-\x1f]+)?::'
+    rb'([\w,.\x80-\xff \t\r\f\v\x1c-\x1f]+)?::',
+    re.MULTILINE
+)
+
+# Any non-ASCII byte.
+NON_ASCII_EXP: re.Pattern = re.compile(rb'[\x80-\xff]')
+
+# Entries counted at a time by `compute_streaming`.
+BATCH_SIZE: int = 1 << 16
+
+
+def iter_matches(file_path: str, start: int = 0, end: Optional[int] = None) -> Iterator[re.Match]:
+    """
+    Matches of ENTRY_EXP over the memory-mapped file, each one only valid until the next one is asked for
+    (the file is unmapped once the iterator is exhausted). Lines with a non-ASCII character that is not a letter
+    or whitespace (e.g. '’' or '°') are skipped, like `main.parse` does.
+
+    :param file_path: File path to the file to be parsed.
+    :param start: Byte offset where to start, the start of a line.
+    :param end: Byte offset where to stop, the end of a line, by default the end of the file.
+    :return: Iterator over the matches, in file order.
+    """
+
+    with open(file_path, "rb") as file:
+
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for match in ENTRY_EXP.finditer(buffer, start, len(buffer) if end is None else end):
+                if not NON_ASCII_EXP.search(buffer, match.start(), match.end()) or \
+                        PARSER_EXP.fullmatch(match[0].decode()):
+                    yield match
+
+
+def iter_entries(file_path: str) -> Iterator[Entry]:
+    """
+    Same entries as `main.parse`, one at a time.
+
+    :param file_path: File path to the file to be parsed.
+    :return: Iterator over the entries, in file order.
+    """
+
+    for match in iter_matches(file_path):
+
+        yield Entry(
+            folder=int(match[1]), date=match[2].decode(), name=match[3].decode(),
+            father=match[4] and match[4].decode(), mother=match[5] and match[5].decode(),
+            obs=match[6] and match[6].decode()
+        )
+
+
+def compute_streaming(file_path: str, batch_size: int = BATCH_SIZE) -> dict[str, dict]:
+    """
+    Same as `main.Storage.compute_all` straight from the file, without storing the entries.
+
+    :param file_path: File path to the file to be parsed.
+    :param batch_size: Entries counted at a time.
+    :return: Dictionary with every distribution, see `queries.Distributions.results`.
+    """
+
+    return count_matches(iter_matches(file_path), batch_size).results()
+
+
+def count_matches(matches: Iterator[re.Match], batch_size: int = BATCH_SIZE,
+                  distributions: Optional[Distributions] = None) -> Distributions:
+    """
+    :param matches: Matches of ENTRY_EXP.
+    :param batch_size: Entries counted at a time.
+    :param distributions: Where to count, a new `queries.Distributions` by default.
+    :return: Distributions of the matched entries.
+    """
+
+    distributions = distributions if distributions is not None else Distributions()
+
+    while batch := [
+        (int(match[2][:4]), match[3].decode(), match[6] and match[6].decode())
+        for match in islice(matches, batch_size)
+    ]:
+        distributions.update(*map(list, zip(*batch)))
+
+    return distributions
@@ -0,0 +1,118 @@
+"""
+Tests of the multi-process distributions, which have to be the same as the serial ones (`main.parse`).
+
+Usage (from this folder, or from the root of the repository with the other tests, see 'conftest'):
+    $> python -m pytest -q
+"""
+
+import json
+import random
+
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from export import export_distributions
+from parallel import compute_parallel, count_parallel, split_file
+from queries import get_century
+from main import Storage, parse
+from stream import compute_streaming, iter_entries
+
+FIRST_NAMES: list[str] = ["Maria", "José", "Ana", "Álvaro", "Inês", "Bento", "Custódio", "Luís"]
+SURNAMES: list[str] = ["Silva", "Araújo", "Costa", "Magalhães", "Sousa", "Gonçalves", "Pereira"]
+RELATIONS: list[str] = ["Irmao", "Primo", "Tio Paterno", "Sobrinho Materno"]
+
+
+def write_processes(file_path: Path, seed: int = 0) -> None:
+    """
+    Writes a file where, in every century, each first name (and each surname) appears the same amount of times,
+    so the top five names are decided by the ties (the order in which they first appear), with a few lines that
+    don't match in between, some of them only because of a non-ASCII character that is not a letter.
+    """
+
+    generator = random.Random(seed)
+    lines: list[str] = []
+
+    for year in (1650, 1701, 1799, 1800, 1850):
+
+        names: list[tuple[str, str]] = [
+            (first, surname) for first in FIRST_NAMES for surname in SURNAMES[:len(FIRST_NAMES) - 1]
+        ]
+        generator.shuffle(names)
+
+        for number, (first, surname) in enumerate(names):
+
+            obs: str = f"{first} {surname},{generator.choice(RELATIONS)}. Proc.{number}." if number % 3 else ""
+            mother: str = f"Ana {surname}" if number % 2 else ""
+
+            lines.append(f"{number + 1}::{year}-{number % 12 + 1:02d}-01::{first} {surname}::José {surname}::"
+                         f"{mother}::{obs}::\n")
+
+            if number % 17 == 0:
+                lines.append("\n" if number % 2 else "not a process\n")
+
+            if number % 13 == 0:
+                symbol: str = "’°«–"[number % 4]
+                lines.append(f"{number + 1}::{year}-01-01::Custódio{symbol} {surname}::::::Irmao. Proc.{number}.::\n")
+
+    file_path.write_text("".join(lines), encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def processes(tmp_path_factory) -> Path:
+
+    file_path: Path = tmp_path_factory.mktemp("processes") / "processos.txt"
+    write_processes(file_path)
+
+    return file_path
+
+
+def test_names_are_tied(processes: Path):
+
+    names: dict[int, Counter] = {}
+
+    for entry in parse(str(processes)).all:
+        names.setdefault(get_century(int(entry["date"][:4])), Counter())[entry["name"].split(" ")[0]] += 1
+
+    assert len(names) > 1
+    assert all(len(set(counter.values())) == 1 for counter in names.values())
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3, 4, 7])
+def test_parallel_is_identical_to_serial(processes: Path, workers: int):
+
+    assert len(split_file(str(processes), workers)) == workers
+
+    serial: Storage = parse(str(processes))
+    expected: str = json.dumps(
+        {"year": serial.dist_by_year(), "names": serial.dist_by_names(), "relations": serial.dist_by_relationship()}
+    )
+
+    assert json.dumps(compute_streaming(str(processes))) == expected
+    assert json.dumps(compute_parallel(str(processes), workers, batch_size=5)) == expected
+
+
+def test_parallel_counts_can_be_exported(processes: Path, tmp_path: Path):
+
+    output: Path = tmp_path / "distributions.json"
+    export_distributions(count_parallel(str(processes), 3, batch_size=5), str(output), use_orjson=False)
+
+    assert output.read_text() == json.dumps(compute_streaming(str(processes)))
+
+
+def test_streaming_drops_what_parse_drops(tmp_path: Path):
+
+    file_path: Path = tmp_path / "symbols.txt"
+    file_path.write_text(
+        "1::1700-01-01::João Silva’s::Pai::Mãe::obs::\n"
+        "2::1700-01-01::João Silva::José Silva::Ana Costa::Irmao. Proc.1.::\n"
+        "3::1701-02-03::Maria «Costa»::::::::\n"
+        "4::1702-03-04::Ana Sousa::Bento Sousa::::Primo – Proc.2, 3°.::\n",
+        encoding="utf-8"
+    )
+
+    entries: list = parse(str(file_path)).all
+
+    assert len(entries) == 1
+    assert list(iter_entries(str(file_path))) == entries
@@ -0,0 +1,288 @@
+"""
+Benchmarks for the csv to json converter.
+
+Usage (from this folder):
+    $> python bench.py plan --rows 1000000
+    $> python bench.py parallel --rows 1000000 --workers 1 2 4 8
+    $> python bench.py aggregate --rows 1000000
+    $> python bench.py shape --rows 1000000
+"""
+
+import argparse
+import itertools
+import os
+import random
+import re
+import tempfile
+import time
+
+from funcs import aggregate, aggregate_column, csv_avg, csv_max, csv_sum, load_numpy
+from main import convert_rows, iter_records
+from parallel import convert_parallel
+from plan import HEADER_EXPR, plan_for
+from writer import write_compact, write_json_array, write_json_lines
+
+HEADER: str = "Número,Nome,Curso,Notas{3,5}::avg,Idades{2}::sum\n"
+
+
+def write_synthetic(file_path: str, rows: int, seed: int = 0) -> None:
+    """
+    Writes a csv file following HEADER with random values.
+
+    :param file_path: Where to write the file.
+    :param rows: Amount of lines to generate.
+    :param seed: Seed of the random generator.
+    :return: None
+    """
+
+    generator = random.Random(seed)
+    names: list[str] = ["Ana Sousa", "João Silva", "Maria Costa", "Rui Pereira", "Inês Araújo"]
+
+    with open(file_path, "w") as file:
+
+        file.write(HEADER)
+
+        for number in range(rows):
+
+            grades: str = ",".join(str(generator.randint(0, 20)) for _ in range(generator.randint(3, 5)))
+            ages: str = f"{generator.randint(18, 30)},{generator.randint(18, 30)}"
+
+            file.write(f"A{number},{generator.choice(names)},LEI,{grades},{ages}\n")
+
+
+def gen_expression_from_header(header: list[tuple[str, str, str]]) -> str:
+    """
+    Regular expression of a whole line, with an optional group per value a range can leave out. This is how the
+    lines used to be split before the compiled header plan, kept to compare against it.
+
+    :param header: Columns of the header, as found by 'plan.HEADER_EXPR'.
+    :return: The regular expression.
+    """
+
+
+    expression: str = r""
+    occurrences: tuple[int, int] = (1, 1)
+
+    for part in header:
+
+        if match := re.match(r"{(\d+)}", part[1]):
+            occurrences = (int(match[1]), int(match[1]))
+
+        elif match := re.match(r"{(\d+),(\d+)}", part[1]):
+
+            if match[1] >= match[2]:
+                raise Exception(f"Invalid range, left number need to be smaller than the right: {part[1]}")
+
+            occurrences = (int(match[1]), int(match[2]))
+
+        if occurrences[0] == occurrences[1]:
+
+            if occurrences[0] == 1:
+                expression += r"([\wà-üÀ-Ü\s.]+),"
+            else:
+                expression += r"(" + (r"[\wà-üÀ-Ü\s.]+," * occurrences[0])[:-1] + r")"
+
+        else:
+            expression += r"(" + (r"[\wà-üÀ-Ü\s.]+," * occurrences[0]) + (r"(?:[\wà-üÀ-Ü\s.]+,)?" * (occurrences[1] - occurrences[0])) + r")"
+
+    return expression[0:(len(expression) - 4):] + expression[(len(expression) - 4) + 1::] + r"$"
+
+
+def bench_plan(file_path: str) -> None:
+    """
+    Times matching and splitting every line with the regular expression built by 'gen_expression_from_header'
+    (the previous approach) and with the compiled header plan.
+
+    :param file_path: csv file to convert.
+    :return: None
+    """
+
+    with open(file_path, "r") as file:
+        header: str = file.readline()
+        lines: list[str] = file.readlines()
+
+    row_expr: str = gen_expression_from_header(HEADER_EXPR.findall(header))
+
+    start: float = time.perf_counter()
+    matched: int = sum(1 for line in lines if (match := re.match(row_expr, line)) and match.groups())
+    regex: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plan = plan_for(header)
+    planned: int = sum(1 for line in lines if plan.split(line) is not None)
+    compiled: float = time.perf_counter() - start
+
+    print(f"{'approach':>10} | {'lines':>9} | {'seconds':>8} | {'lines/s':>10}")
+    print(f"{'regex':>10} | {matched:>9} | {regex:>8.3f} | {len(lines) / regex:>10.0f}")
+    print(f"{'plan':>10} | {planned:>9} | {compiled:>8.3f} | {len(lines) / compiled:>10.0f}")
+    print(f"(Plan is {regex / compiled:.2f}x faster.)")
+
+
+def bench_parallel(file_path: str, workers: list[int]) -> None:
+    """
+    Times converting the file into JSON Lines with a single process ('iter_records') and with 'convert_parallel'
+    for different amounts of workers, and prints the throughput and speedup of each.
+
+    :param file_path: csv file to convert.
+    :param workers: Amounts of workers to try.
+    :return: None
+    """
+
+    with open(file_path, "r") as file:
+        lines: int = sum(1 for _ in file) - 1
+
+    print(f"{'workers':>8} | {'seconds':>8} | {'lines/s':>10} | {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        output_path: str = os.path.join(directory, "output.jsonl")
+
+        start: float = time.perf_counter()
+        with open(output_path, "w") as output:
+            write_json_lines(iter_records(file_path), output)
+        baseline: float = time.perf_counter() - start
+
+        print(f"{'serial':>8} | {baseline:>8.3f} | {lines / baseline:>10.0f} | {1:>7.2f}x")
+
+        for amount in workers:
+
+            start = time.perf_counter()
+            with open(output_path, "w") as output:
+                convert_parallel(file_path, output, workers=amount, output_format="jsonl")
+            elapsed: float = time.perf_counter() - start
+
+            print(f"{amount:>8} | {elapsed:>8.3f} | {lines / elapsed:>10.0f} | {baseline / elapsed:>7.2f}x")
+
+    print(f"(Machine has {os.cpu_count()} CPUs.)")
+
+
+def bench_aggregate(file_path: str) -> None:
+    """
+    Times computing the sum, average and maximum of the grades of every line with the separate functions (each
+    one parses the field again), with the fused 'aggregate' and with 'aggregate_column' over the whole column.
+
+    :param file_path: csv file following HEADER.
+    :return: None
+    """
+
+    with open(file_path, "r") as file:
+        plan = plan_for(file.readline())
+        column: list[str] = [columns[3] for line in file if (columns := plan.split(line)) is not None]
+
+    names: tuple[str, ...] = ("sum", "avg", "max")
+
+    approaches: dict = {
+        "separate": lambda: [
+            {"sum": csv_sum(values, ","), "avg": csv_avg(values, ","), "max": csv_max(values, ",")}
+            for values in column
+        ],
+        "fused": lambda: [aggregate(values, ",", names) for values in column],
+        "column": lambda: aggregate_column(column, ",", names)
+    }
+
+    print(f"{'approach':>10} | {'seconds':>8} | {'fields/s':>10}")
+
+    results: list = []
+
+    for name, approach in approaches.items():
+
+        start: float = time.perf_counter()
+        results.append(approach())
+        elapsed: float = time.perf_counter() - start
+
+        print(f"{name:>10} | {elapsed:>8.3f} | {len(column) / elapsed:>10.0f}")
+
+    print(f"(Same results: {all(result == results[0] for result in results)}, "
+          f"column path {'with' if load_numpy() else 'without'} NumPy.)")
+
+
+def bench_shape(file_path: str) -> None:
+    """
+    Times writing the converted file as a json array with a single-key object per field (the previous shape),
+    with a record per line and with the compact layout, and compares the size of the outputs.
+
+    :param file_path: csv file to convert.
+    :return: None
+    """
+
+    with open(file_path, "r") as file:
+        plan = plan_for(file.readline())
+        rows: list[list] = list(convert_rows(plan, file))
+
+    keys: list[str] = plan.keys
+
+    shapes: dict = {
+        "fields": lambda output: write_json_array(
+            ({key: value} for row in rows for key, value in zip(keys, row)), output
+        ),
+        "records": lambda output: write_json_array((dict(zip(keys, row)) for row in rows), output),
+        "compact": lambda output: write_compact(itertools.chain([keys], rows), output)
+    }
+
+    print(f"{'shape':>10} | {'seconds':>8} | {'MiB':>8} | {'time':>6} | {'size':>6}")
+
+    baseline: tuple[float, int] = (0, 0)
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        output_path: str = os.path.join(directory, "output.json")
+
+        for name, write in shapes.items():
+
+            start: float = time.perf_counter()
+            with open(output_path, "w") as output:
+                write(output)
+            elapsed: float = time.perf_counter() - start
+
+            size: int = os.path.getsize(output_path)
+            baseline = baseline if baseline[0] else (elapsed, size)
+
+            print(f"{name:>10} | {elapsed:>8.3f} | {size / (1 << 20):>8.1f} | "
+                  f"{elapsed / baseline[0]:>5.2f}x | {size / baseline[1]:>5.2f}x")
+
+
+def main():
+
+    arguments = argparse.ArgumentParser(description="csv to json benchmarks.")
+    commands = arguments.add_subparsers(dest="command", required=True)
+
+    plan = commands.add_parser("plan", help="Regular expression per line against the compiled header plan.")
+    plan.add_argument("--file", help="csv file to convert, a synthetic one is generated by default.")
+    plan.add_argument("--rows", type=lambda value: int(float(value)), default=1_000_000)
+
+    parallel = commands.add_parser("parallel", help="Throughput of the multi-process conversion.")
+    parallel.add_argument("--file", help="csv file to convert, a synthetic one is generated by default.")
+    parallel.add_argument("--rows", type=lambda value: int(float(value)), default=1_000_000)
+    parallel.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+
+    aggregations = commands.add_parser("aggregate", help="Separate functions against the fused aggregations.")
+    aggregations.add_argument("--file", help="csv file following HEADER, a synthetic one is generated by default.")
+    aggregations.add_argument("--rows", type=lambda value: int(float(value)), default=1_000_000)
+
+    shape = commands.add_parser("shape", help="Time and size of the json of each output shape.")
+    shape.add_argument("--file", help="csv file to convert, a synthetic one is generated by default.")
+    shape.add_argument("--rows", type=lambda value: int(float(value)), default=1_000_000)
+
+    args = arguments.parse_args()
+
+    benches: dict = {
+        "shape": bench_shape,
+        "plan": bench_plan,
+        "aggregate": bench_aggregate,
+        "parallel": lambda file_path: bench_parallel(file_path, args.workers)
+    }
+
+    if args.file:
+        benches[args.command](args.file)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        file_path: str = os.path.join(directory, "synthetic.csv")
+        write_synthetic(file_path, args.rows)
+
+        benches[args.command](file_path)
+
+
+if __name__ == '__main__':
+    SystemExit(main())
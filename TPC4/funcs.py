@@ -1,3 +1,24 @@
+from functools import cache
+
+# Aggregations computed by 'aggregate' and 'aggregate_column', any of them can be combined in a header,
+# e.g. Notas{3,5}::sum+avg+max
+AGGREGATES: tuple[str, ...] = ("sum", "avg", "min", "max", "count", "stddev", "median")
+
+
+@cache
+def load_numpy():
+    """
+    Imports NumPy the first time it is needed.
+    :return: The numpy module, or None if it is not installed.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    return numpy
+
 
 def as_number_list(values: str, delimiter: str):
     return [float(elem) for elem in values.split(delimiter)]
@@ -8,7 +29,8 @@ def csv_sum(values: str, delimiter: str):
 
 
 def csv_avg(values: str, delimiter: str):
-    return csv_sum(values, delimiter) / (values.count(delimiter) + 1)
+    numbers: list[float] = as_number_list(values, delimiter)
+    return sum(numbers) / len(numbers)
 
 
 def csv_max(values: str, delimiter: str):
@@ -19,6 +41,150 @@ def csv_min(values: str, delimiter: str):
     return min(as_number_list(values, delimiter))
 
 
+def csv_count(values: str, delimiter: str):
+    return aggregate(values, delimiter, ("count",))["count"]
+
+
+def csv_stddev(values: str, delimiter: str):
+    return aggregate(values, delimiter, ("stddev",))["stddev"]
+
+
+def csv_median(values: str, delimiter: str):
+    return aggregate(values, delimiter, ("median",))["median"]
+
+
 def csv_concat(values: str, delimiter: str):
     return "".join([elem for elem in values.split(delimiter)])
 
+
+def aggregate(values: str, delimiter: str, names: tuple[str, ...]) -> dict[str, float]:
+    """
+    Parses the values of a field once and computes every requested aggregation over them.
+
+    :param values: Values of the field separated by the delimiter.
+    :param delimiter: Delimiter of the csv file.
+    :param names: Aggregations to compute, any of AGGREGATES.
+    :return: Dictionary with the result of each aggregation, in the requested order.
+    """
+
+    return reduce_numbers(as_number_list(values, delimiter), names)
+
+
+def reduce_numbers(numbers: list[float], names: tuple[str, ...]) -> dict[str, float]:
+    """
+    :param numbers: Values of a field.
+    :param names: Aggregations to compute, any of AGGREGATES.
+    :return: Dictionary with the result of each aggregation, in the requested order.
+    """
+
+    total: float = sum(numbers)
+    mean: float = total / len(numbers)
+
+    results: dict[str, float] = {}
+
+    for name in names:
+
+        if name == "sum":
+            results[name] = total
+
+        elif name == "avg":
+            results[name] = mean
+
+        elif name == "min":
+            results[name] = min(numbers)
+
+        elif name == "max":
+            results[name] = max(numbers)
+
+        elif name == "count":
+            results[name] = len(numbers)
+
+        elif name == "stddev":
+            results[name] = (sum((number - mean) ** 2 for number in numbers) / len(numbers)) ** 0.5
+
+        elif name == "median":
+            ordered: list[float] = sorted(numbers)
+            middle: int = len(ordered) // 2
+            results[name] = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+        else:
+            raise Exception(f"Unknown aggregation: {name}")
+
+    return results
+
+
+def parse_column(column: list[str], delimiter: str):
+    """
+    Parses every field of a column.
+    With NumPy the column becomes a single matrix with a row per field, padded with NaN where a field has less
+    values than the widest one. Without NumPy it becomes a list with the values of each field.
+
+    :param column: Fields of the column, each with its values separated by the delimiter.
+    :param delimiter: Delimiter of the csv file.
+    :return: The matrix, or the list of lists of values.
+    """
+
+    np = load_numpy()
+
+    if np is None or not column:
+        return [as_number_list(values, delimiter) for values in column]
+
+    # Every value of the column is parsed in a single pass and scattered into its row of the padded matrix.
+    values = np.array(list(map(float, delimiter.join(column).split(delimiter))), dtype=np.float64)
+    lengths = np.array([field.count(delimiter) + 1 for field in column])
+    starts = np.cumsum(lengths) - lengths
+
+    matrix = np.full((len(column), int(lengths.max())), np.nan)
+    matrix[np.repeat(np.arange(len(column)), lengths), np.arange(len(values)) - np.repeat(starts, lengths)] = values
+
+    return matrix
+
+
+def reduce_column(values, names: tuple[str, ...]) -> dict[str, list]:
+    """
+    Computes the aggregations of every field of a parsed column, reducing the rows of the matrix with NumPy.
+
+    :param values: Result of 'parse_column'.
+    :param names: Aggregations to compute, any of AGGREGATES.
+    :return: Dictionary with the results of each aggregation, one per field, in the requested order.
+    """
+
+    np = load_numpy()
+
+    if np is None or not isinstance(values, np.ndarray):
+        rows: list[dict[str, float]] = [reduce_numbers(numbers, names) for numbers in values]
+        return {name: [row[name] for row in rows] for name in names}
+
+    counts = np.count_nonzero(~np.isnan(values), axis=1)
+    totals = np.nansum(values, axis=1)
+
+    reductions: dict = {
+        "sum": lambda: totals,
+        "avg": lambda: totals / counts,
+        "min": lambda: np.nanmin(values, axis=1),
+        "max": lambda: np.nanmax(values, axis=1),
+        "count": lambda: counts,
+        "stddev": lambda: np.nanstd(values, axis=1),
+        "median": lambda: np.nanmedian(values, axis=1)
+    }
+
+    for name in names:
+        if name not in reductions:
+            raise Exception(f"Unknown aggregation: {name}")
+
+    return {name: reductions[name]().tolist() for name in names}
+
+
+def aggregate_column(column: list[str], delimiter: str, names: tuple[str, ...]) -> list[dict[str, float]]:
+    """
+    Same as 'aggregate' for every field of a column at once, see 'parse_column' and 'reduce_column'.
+
+    :param column: Fields of the column, each with its values separated by the delimiter.
+    :param delimiter: Delimiter of the csv file.
+    :param names: Aggregations to compute, any of AGGREGATES.
+    :return: List with the result of 'aggregate' for each field.
+    """
+
+    results: dict[str, list] = reduce_column(parse_column(column, delimiter), names)
+
+    return [dict(zip(names, row)) for row in zip(*results.values())]
@@ -1,65 +1,134 @@
-import re
+import argparse
+import sys
 
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable, Iterator
 
 from funcs import *
+from plan import Column, HeaderPlan, plan_for
+# AVAILABLE_FUNCTIONS is still importable from here, where it used to be defined.
+from registry import AVAILABLE_FUNCTIONS, BATCH_FUNCTIONS, FUSED, get_function
+from writer import WRITERS
 
-AVAILABLE_FUNCTIONS = {
-    "sum": csv_sum,
-    "avg": csv_avg,
-    "max": csv_max,
-    "min": csv_min,
-    "concat": csv_concat
-}
 
+def apply_func(func: Callable[[str, str], any], on: str, delimiter: str) -> any:
+    return func(on, delimiter)
+
+
+def convert_field(column: Column, elem: str, delimiter: str = ",") -> any:
+    """
+    :param column: Column of the field.
+    :param elem: Text of the field, its values separated by the delimiter.
+    :param delimiter: Delimiter of the csv file.
+    :return: Result of the function of the column, a dictionary with the result of each function if the column
+    has several, or the list of values if it has none. Functions that are not registered raise an exception.
+    """
 
-def gen_expression_from_header(header: list[tuple[str, str, str]]) -> str:
+    functions: tuple[str, ...] = column.functions
 
-    expression: str = r""
-    occurrences: tuple[int, int] = (1, 1)
+    if not functions:
+        return elem.split(delimiter)
 
-    for part in header:
+    if len(functions) > 1:
 
-        if match := re.match(r"{(\d+)}", part[1]):
-            occurrences = (int(match[1]), int(match[1]))
+        if all(name in FUSED for name in functions):
+            return aggregate(elem, delimiter, functions)
 
-        elif match := re.match(r"{(\d+),(\d+)}", part[1]):
+        return {name: apply_func(get_function(name), elem, delimiter) for name in functions}
 
-            if match[1] >= match[2]:
-                raise Exception(f"Invalid range, left number need to be smaller than the right: {part[1]}")
+    return apply_func(get_function(column.function), elem, delimiter)
 
-            occurrences = (int(match[1]), int(match[2]))
 
-        if occurrences[0] == occurrences[1]:
+def convert_column(column: Column, fields: list[str], delimiter: str = ",") -> list:
+    """
+    Same as 'convert_field' for every field of a column. When every function of the column has a batch
+    implementation the column is parsed once and each function is computed for the whole column at once.
 
-            if occurrences[0] == 1:
-                expression += r"([\wà-üÀ-Ü\s.]+),"
-            else:
-                expression += r"(" + (r"[\wà-üÀ-Ü\s.]+," * occurrences[0])[:-1] + r")"
+    :param column: The column.
+    :param fields: Text of every field of the column.
+    :param delimiter: Delimiter of the csv file.
+    :return: List with the converted fields.
+    """
 
-        else:
-            expression += r"(" + (r"[\wà-üÀ-Ü\s.]+," * occurrences[0]) + (r"(?:[\wà-üÀ-Ü\s.]+,)?" * (occurrences[1] - occurrences[0])) + r")"
+    functions: tuple[str, ...] = column.functions
 
-    return expression[0:(len(expression) - 4):] + expression[(len(expression) - 4) + 1::] + r"$"
+    if not functions or not all(name in BATCH_FUNCTIONS for name in functions):
+        return [convert_field(column, elem, delimiter) for elem in fields]
 
+    values = parse_column(fields, delimiter)
 
-def get_functions_from_header(header: list[tuple[str, str, str]]) -> dict[int, str]:
+    # The built-in aggregations share their work (the counts and sums of each field) when computed together.
+    if all(name in FUSED for name in functions):
+        results: list[list] = list(reduce_column(values, functions).values())
+    else:
+        results: list[list] = [BATCH_FUNCTIONS[name](values) for name in functions]
 
-    result: dict[int, str] = {}
+    if len(functions) == 1:
+        return results[0]
 
-    for index, part in enumerate(header):
-        if part[2][2:] in AVAILABLE_FUNCTIONS:
-            result[index] = part[2][2:]
+    return [dict(zip(functions, row)) for row in zip(*results)]
 
-    return result
 
+def convert_rows(plan: HeaderPlan, lines: Iterable[str], delimiter: str = ",") -> Iterator[list]:
+    """
+    Converts lines that follow the header of the plan, lines that don't are skipped.
 
-def apply_func(func: Callable[[str, str], any], on: str, delimiter: str) -> any:
-    return func(on, delimiter)
+    :param plan: Plan of the header of the csv file.
+    :param lines: Lines of the csv file, without the header.
+    :param delimiter: Delimiter of the csv file.
+    :return: Iterator over the converted fields of each line, in the order of the header.
+    """
 
+    for line in lines:
+        if (columns := plan.split(line)) is not None:
+            yield [convert_field(column, elem, delimiter) for column, elem in zip(plan.columns, columns)]
+
+
+def convert_lines(plan: HeaderPlan, lines: Iterable[str], delimiter: str = ",") -> Iterator[dict]:
+    """
+    Same as 'convert_rows', with each line as a record (the columns of the header as keys).
+
+    :return: Iterator over the records of the lines.
+    """
+
+    keys: list[str] = plan.keys
+
+    for row in convert_rows(plan, lines, delimiter):
+        yield dict(zip(keys, row))
+
+
+def iter_records(csv_file: Path, delimiter: str = ",") -> Iterator[dict]:
+    """
+    Converts the csv file line by line, yielding each record as soon as it is built. Only the current line is
+    kept in memory.
 
-def csv_to_json(csv_file: Path, delimiter: str = ","):
+    :return: Iterator over the records of the converted csv file.
+    """
+
+    with open(csv_file, 'r') as file:
+
+        plan: HeaderPlan = plan_for(file.readline(), delimiter)
+
+        yield from convert_lines(plan, file, delimiter)
+
+
+def iter_rows(csv_file: Path, delimiter: str = ",") -> Iterator[list]:
+    """
+    Same as 'iter_records' for the compact layout: yields the columns of the header first, and then the converted
+    fields of each line (see 'writer.write_compact').
+
+    :return: Iterator over the columns and the rows of the converted csv file.
+    """
+
+    with open(csv_file, 'r') as file:
+
+        plan: HeaderPlan = plan_for(file.readline(), delimiter)
+
+        yield plan.keys
+        yield from convert_rows(plan, file, delimiter)
+
+
+def csv_to_json(csv_file: Path, delimiter: str = ",", compact: bool = False):
     """
     Lines can either be:
 
@@ -67,49 +136,62 @@ def csv_to_json(csv_file: Path, delimiter: str = ","):
         Número,Nome,Curso{2},,
         Número,Nome,Curso{3,5},,,,,
         Número,Nome,Curso{2,4}::sum,,,,
+        Número,Nome,Curso{2,4}::sum+avg+max,,,,
+
+    The whole file is converted column by column, see 'convert_column'.
 
+    :param compact: Instead of a record per line, the columns of the header once and a list of fields per line.
     :return: Converted csv file as json.
     """
 
-    result: list[dict] = []
+    with open(csv_file, 'r') as file:
+        plan: HeaderPlan = plan_for(file.readline(), delimiter)
+        rows: list[tuple[str, ...]] = [columns for line in file if (columns := plan.split(line)) is not None]
 
-    header_expr: str = r'([\wà-üÀ-Ü]+(?:({\d+}|{\d+,\d+})(::\w+)?)?)'
+    fields: list[list] = [
+        convert_column(column, list(values), delimiter) for column, values in zip(plan.columns, zip(*rows))
+    ]
 
-    with open(csv_file, 'r') as file:
-        lines: list[str] = [line for line in file.readlines() if line]
+    if compact:
+        return {"columns": plan.keys, "rows": [list(row) for row in zip(*fields)]}
 
-    header = lines.pop(0)
-    header = re.findall(header_expr, header)
+    keys: list[str] = plan.keys
 
-    if not header:
-        raise Exception(f"The header is not valid: {header}")
+    return [dict(zip(keys, row)) for row in zip(*fields)]
 
-    row_expr: str = gen_expression_from_header(header)
-    row_func: dict[int, str] = get_functions_from_header(header)
 
-    print(row_expr)
+def main():
 
-    for line in lines:
+    arguments = argparse.ArgumentParser(description="Converts csv files into json.")
 
-        if match := re.match(row_expr, line):
-            for index, elem in enumerate(match.groups()):
+    arguments.add_argument("file", nargs="?", default="./dataset.csv", help="csv file to convert.")
+    arguments.add_argument("--output", help="Where to write the json, by default the standard output.")
+    arguments.add_argument("--format", choices=WRITERS, default="array",
+                           help="A single json array of records, one record per line (JSON Lines) or the columns "
+                                "once and a list of fields per line (compact).")
+    arguments.add_argument("--delimiter", default=",")
+    arguments.add_argument("--workers", type=int, default=1,
+                           help="Amount of processes converting the file, each one a range of its lines.")
 
-                obj: dict = {}
+    args = arguments.parse_args()
 
-                if index in row_func:
-                    obj[header[index][0]] = apply_func(AVAILABLE_FUNCTIONS[row_func[index]], elem, delimiter)
+    if args.workers > 1:
+        # Imported here, 'parallel' imports this module for the conversion itself.
+        from parallel import convert_parallel
 
-                else:
-                    obj[header[index][0]] = [e for e in elem.split(delimiter)]
+        write = lambda output: convert_parallel(Path(args.file), output, args.delimiter, args.workers, args.format)
 
-                result.append(obj)
+    else:
+        source: Callable = iter_rows if args.format == "compact" else iter_records
 
-    return result
+        write = lambda output: WRITERS[args.format](source(Path(args.file), args.delimiter), output)
 
+    if args.output is None:
+        write(sys.stdout)
+        return
 
-def main():
-    result = csv_to_json(Path("./dataset.csv"))
-    print(result)
+    with open(args.output, "w") as output:
+        write(output)
 
 
 if __name__ == '__main__':
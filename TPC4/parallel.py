@@ -0,0 +1,179 @@
+"""
+Multi-process conversion of csv files into json.
+
+The body of the file is split into byte ranges that start and end on a line boundary, every process converts a
+range into a JSON Lines shard and the shards are concatenated, in file order, into the output.
+"""
+
+import json
+import os
+import pickle
+import shutil
+import tempfile
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TextIO
+
+from main import convert_lines, convert_rows
+from plan import HeaderPlan, plan_for
+from registry import restore, snapshot
+from writer import write_json_lines
+
+
+def split_file(csv_file: Path, parts: int) -> list[tuple[int, int]]:
+    """
+    Splits the body of the csv file (everything after the header) into byte ranges that start and end on a
+    line boundary, so that each range can be converted independently.
+
+    :param csv_file: Path to the csv file.
+    :param parts: Amount of ranges to split the file into.
+    :return: List with the (start, end) byte offsets of each range, in file order.
+    """
+
+    size: int = os.path.getsize(csv_file)
+
+    with open(csv_file, "rb") as file:
+
+        file.readline()
+        bounds: list[int] = [file.tell()]
+
+        for part in range(1, parts):
+
+            file.seek(max(bounds[0] + (size - bounds[0]) * part // parts, bounds[-1]))
+            file.readline()
+
+            bounds.append(file.tell())
+
+    bounds.append(size)
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def read_lines(csv_file: Path, start: int, end: int) -> Iterator[str]:
+    """
+    :param csv_file: Path to the csv file.
+    :param start: Byte offset of the first line to read.
+    :param end: Byte offset where to stop reading.
+    :return: Iterator over the lines of the range.
+    """
+
+    with open(csv_file, "rb") as file:
+
+        file.seek(start)
+
+        while start < end and (line := file.readline()):
+            start += len(line)
+            yield line.decode()
+
+
+def convert_shard(csv_file: Path, delimiter: str, start: int, end: int, shard_path: str,
+                  compact: bool = False) -> int:
+    """
+    Converts a range of lines of the csv file into a JSON Lines file. Runs on a worker process, with the functions
+    registered on the main one (see 'registry.restore').
+
+    :param csv_file: Path to the csv file.
+    :param delimiter: Delimiter of the csv file.
+    :param start: Byte offset of the first line to convert.
+    :param end: Byte offset where to stop converting.
+    :param shard_path: Where to write the records.
+    :param compact: Write the fields of each line as a list instead of a record.
+    :return: Amount of records written.
+    """
+
+    with open(csv_file, "r") as file:
+        plan: HeaderPlan = plan_for(file.readline(), delimiter)
+
+    convert: Callable = convert_rows if compact else convert_lines
+
+    with open(shard_path, "w") as shard:
+        return write_json_lines(convert(plan, read_lines(csv_file, start, end), delimiter), shard)
+
+
+def concatenate(shard_paths: list[str], output: TextIO, output_format: str = "array",
+                columns: Optional[list[str]] = None) -> None:
+    """
+    Writes the shards, in order, into the output.
+
+    :param shard_paths: JSON Lines files written by 'convert_shard', in file order.
+    :param output: Open text file (or sys.stdout) to write into.
+    :param output_format: 'jsonl' to copy the shards as they are, 'array' to join their records into an array,
+    'compact' to join their rows after the columns (see 'writer.write_compact').
+    :param columns: Columns of the header, for the compact format.
+    :return: None
+    """
+
+    if output_format == "jsonl":
+        for shard_path in shard_paths:
+            with open(shard_path, "r") as shard:
+                shutil.copyfileobj(shard, output)
+        return
+
+    if output_format == "compact":
+        output.write('{"columns": ' + json.dumps(columns, ensure_ascii=False) + ',\n "rows": ')
+
+    separator: str = "\n"
+    output.write("[")
+
+    for shard_path in shard_paths:
+        with open(shard_path, "r") as shard:
+            for line in shard:
+                output.write(separator)
+                output.write(line[:-1])
+                separator = ",\n"
+
+    output.write("]" if separator == "\n" else "\n]")
+    output.write("}\n" if output_format == "compact" else "\n")
+
+
+def convert_parallel(csv_file: Path, output: TextIO, delimiter: str = ",", workers: Optional[int] = None,
+                     output_format: str = "array") -> int:
+    """
+    Converts the csv file using a pool of processes and writes the json into the output, in the same order as
+    a single process would.
+
+    :param csv_file: Path to the csv file.
+    :param output: Open text file (or sys.stdout) to write into.
+    :param delimiter: Delimiter of the csv file.
+    :param workers: Amount of processes to use, by default the number of CPUs.
+    :param output_format: 'jsonl', 'array' or 'compact', see 'writer.WRITERS'.
+    :return: Amount of records written.
+    """
+
+    if not os.path.isfile(csv_file):
+        raise Exception(f"{csv_file} is not an existing file.")
+
+    workers = workers or os.cpu_count() or 1
+
+    with open(csv_file, "r") as file:
+        columns: list[str] = plan_for(file.readline(), delimiter).keys
+
+    functions: tuple[dict, dict, set] = snapshot()
+
+    # Checked here, instead of failing on each worker when they are spawned (forked ones would not need it).
+    for name, function in [*functions[0].items(), *functions[1].items()]:
+        try:
+            pickle.dumps(function)
+        except Exception:
+            raise Exception(f"The function {name} can't be sent to the workers, it has to be defined at the top "
+                            f"level of a module (not a lambda).")
+
+    with tempfile.TemporaryDirectory() as directory, \
+            ProcessPoolExecutor(max_workers=workers, initializer=restore, initargs=functions) as executor:
+
+        shard_paths: list[str] = []
+        written: list = []
+
+        for number, (start, end) in enumerate(split_file(csv_file, workers)):
+
+            shard_paths.append(os.path.join(directory, f"shard-{number}.jsonl"))
+            written.append(executor.submit(
+                convert_shard, csv_file, delimiter, start, end, shard_paths[-1], output_format == "compact"
+            ))
+
+        total: int = sum(future.result() for future in written)
+
+        concatenate(shard_paths, output, output_format, columns)
+
+    return total
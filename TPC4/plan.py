@@ -0,0 +1,131 @@
+import re
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+# A single value of a csv field.
+VALUE_EXPR: str = r"[\wà-üÀ-Ü\s.]+"
+
+# A column of the header: name, optional {n} or {n,m} and optional ::function (or ::function+function+...).
+HEADER_EXPR: re.Pattern = re.compile(r'([\wà-üÀ-Ü]+(?:({\d+}|{\d+,\d+})(::\w+(?:\+\w+)*)?)?)')
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    Attributes:
+        key (str): The column as written in the header, used as the key of the json objects.
+        minimum (int): Minimum amount of values of the column.
+        maximum (int): Maximum amount of values of the column.
+        function (Optional[str]): Name of the function to apply to the values, if any, several are joined by '+'.
+    """
+
+    key: str
+    minimum: int
+    maximum: int
+    function: Optional[str]
+
+    @property
+    def functions(self) -> tuple[str, ...]:
+        return tuple(self.function.split("+")) if self.function else ()
+
+
+class HeaderPlan:
+    """
+    Everything needed to convert the lines of a csv file, computed once from its header.
+
+    The amount of values of a line is found by counting its delimiters, and every possible amount has its own
+    compiled expression with one group per column and no optional parts: every column gets its minimum and the
+    ones with a range take the extra values from left to right. Matching a line is then a single pass, without
+    the backtracking of the optional groups of 'bench.gen_expression_from_header'.
+    """
+
+    def __init__(self, header: str, delimiter: str = ","):
+        """
+        Class constructor.
+        :param header: First line of the csv file.
+        :param delimiter: Delimiter of the csv file.
+        """
+
+        parts: list[tuple[str, str, str]] = HEADER_EXPR.findall(header)
+
+        if not parts:
+            raise Exception(f"The header is not valid: {header}")
+
+        self.delimiter = delimiter
+        self.columns: list[Column] = [self.__parse_column__(part) for part in parts]
+
+        self.minimum: int = sum(column.minimum for column in self.columns)
+        self.maximum: int = sum(column.maximum for column in self.columns)
+
+        # Amount of values of a line -> expression that matches it, with a group per column.
+        self.expressions: dict[int, re.Pattern] = {
+            amount: self.__compile__(amount) for amount in range(self.minimum, self.maximum + 1)
+        }
+
+    def __compile__(self, amount: int) -> re.Pattern:
+
+        extra: int = amount - self.minimum
+        groups: list[str] = []
+
+        for column in self.columns:
+
+            taken: int = column.minimum + min(extra, column.maximum - column.minimum)
+            extra -= taken - column.minimum
+
+            groups.append("(" + re.escape(self.delimiter).join([VALUE_EXPR] * taken) + ")")
+
+        return re.compile(re.escape(self.delimiter).join(groups))
+
+    @staticmethod
+    def __parse_column__(part: tuple[str, str, str]) -> Column:
+
+        occurrences: tuple[int, int] = (1, 1)
+
+        if match := re.fullmatch(r"{(\d+)}", part[1]):
+            occurrences = (int(match[1]), int(match[1]))
+
+        elif match := re.fullmatch(r"{(\d+),(\d+)}", part[1]):
+
+            if int(match[1]) >= int(match[2]):
+                raise Exception(f"Invalid range, left number need to be smaller than the right: {part[1]}")
+
+            occurrences = (int(match[1]), int(match[2]))
+
+        return Column(part[0], occurrences[0], occurrences[1], part[2][2:] or None)
+
+    @property
+    def keys(self) -> list[str]:
+        return [column.key for column in self.columns]
+
+    def split(self, line: str) -> Optional[tuple[str, ...]]:
+        """
+        Split a line into the text of each column (values of a column are still separated by the delimiter).
+
+        :param line: Line of the csv file.
+        :return: Tuple with the text of each column, or None if the line does not follow the header.
+        """
+
+        line = line.rstrip("\r\n")
+
+        if (expression := self.expressions.get(line.count(self.delimiter) + 1)) is None:
+            return None
+
+        if (match := expression.fullmatch(line)) is None:
+            return None
+
+        return match.groups()
+
+
+@lru_cache(maxsize=32)
+def plan_for(header: str, delimiter: str = ",") -> HeaderPlan:
+    """
+    Plan of a header, files sharing the same header share the same (already compiled) plan.
+
+    :param header: First line of the csv file.
+    :param delimiter: Delimiter of the csv file.
+    :return: The plan.
+    """
+
+    return HeaderPlan(header.rstrip("\r\n"), delimiter)
@@ -0,0 +1,122 @@
+"""
+Registry of the functions that can be applied to the columns of a csv file (the '::function' of the header).
+
+Every function has a scalar implementation, called with the text of a single field and the delimiter, and may have
+a batch implementation, called once per column with every field already parsed: a matrix with a row per field,
+padded with NaN ('numpy.ndarray', when NumPy is installed) or a list with the values of each field (otherwise).
+The batch implementation returns a list with a result per field, and has to ignore the NaN padding.
+
+    >>> def csv_range(values, delimiter):
+    ...     return csv_max(values, delimiter) - csv_min(values, delimiter)
+    >>> def column_range(values):
+    ...     return (numpy.nanmax(values, axis=1) - numpy.nanmin(values, axis=1)).tolist()
+    >>> register("range", csv_range, column_range)
+
+Functions registered before converting with several workers are sent to them (see 'snapshot' and 'restore'),
+whatever the start method of the processes, so they have to be picklable: defined at the top level of a module,
+not lambdas.
+"""
+
+from functools import partial
+from typing import Callable, Optional
+
+from funcs import *
+
+# Name -> scalar implementation, the names a header can use.
+AVAILABLE_FUNCTIONS: dict[str, Callable[[str, str], any]] = {}
+
+# Name -> batch implementation, for the functions that have one.
+BATCH_FUNCTIONS: dict[str, Callable[[any], list]] = {}
+
+# Built-in aggregations that were not replaced, they can be computed together by 'funcs.aggregate'.
+FUSED: set[str] = set()
+
+
+def register(name: str, scalar: Callable[[str, str], any], batch: Optional[Callable[[any], list]] = None) -> None:
+    """
+    Registers (or replaces) a function.
+
+    :param name: Name used in the header, e.g. 'range' for Notas{3,5}::range
+    :param scalar: Function of the text of a field and the delimiter.
+    :param batch: Function of a parsed column that returns a result per field, if the function has one.
+    :return: None
+    """
+
+    if not name.isidentifier():
+        raise Exception(f"Invalid function name: {name}")
+
+    AVAILABLE_FUNCTIONS[name] = scalar
+    FUSED.discard(name)
+
+    if batch is None:
+        BATCH_FUNCTIONS.pop(name, None)
+    else:
+        BATCH_FUNCTIONS[name] = batch
+
+
+def unregister(name: str) -> None:
+    """
+    :param name: Name of the function to remove.
+    :return: None
+    """
+
+    AVAILABLE_FUNCTIONS.pop(name, None)
+    BATCH_FUNCTIONS.pop(name, None)
+    FUSED.discard(name)
+
+
+def get_function(name: str) -> Callable[[str, str], any]:
+    """
+    :param name: Name used in the header.
+    :return: Scalar implementation of the function.
+    """
+
+    if name not in AVAILABLE_FUNCTIONS:
+        raise Exception(f"Unknown function: {name}, available ones are {', '.join(AVAILABLE_FUNCTIONS)}")
+
+    return AVAILABLE_FUNCTIONS[name]
+
+
+def snapshot() -> tuple[dict, dict, set]:
+    """
+    :return: Copy of every registered function, to be restored on another process (see 'restore').
+    """
+
+    return dict(AVAILABLE_FUNCTIONS), dict(BATCH_FUNCTIONS), set(FUSED)
+
+
+def restore(functions: dict, batch_functions: dict, fused: set) -> None:
+    """
+    Replaces the registered functions with a snapshot of them. Used as the initializer of the worker processes,
+    which (when spawned instead of forked) would otherwise only have the built-in functions.
+
+    :param functions: Scalar implementations, see 'snapshot'.
+    :param batch_functions: Batch implementations.
+    :param fused: Built-in aggregations that were not replaced.
+    :return: None
+    """
+
+    AVAILABLE_FUNCTIONS.clear()
+    AVAILABLE_FUNCTIONS.update(functions)
+
+    BATCH_FUNCTIONS.clear()
+    BATCH_FUNCTIONS.update(batch_functions)
+
+    FUSED.clear()
+    FUSED.update(fused)
+
+
+def __builtin_batch__(values, name: str) -> list:
+    return reduce_column(values, (name,))[name]
+
+
+register("sum", csv_sum, partial(__builtin_batch__, name="sum"))
+register("avg", csv_avg, partial(__builtin_batch__, name="avg"))
+register("max", csv_max, partial(__builtin_batch__, name="max"))
+register("min", csv_min, partial(__builtin_batch__, name="min"))
+register("count", csv_count, partial(__builtin_batch__, name="count"))
+register("stddev", csv_stddev, partial(__builtin_batch__, name="stddev"))
+register("median", csv_median, partial(__builtin_batch__, name="median"))
+register("concat", csv_concat)
+
+FUSED.update(AGGREGATES)
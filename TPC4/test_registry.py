@@ -0,0 +1,127 @@
+"""
+Tests of the registry of column functions, over columns with a variable amount of values.
+
+Usage (from this folder, or from the root of the repository with the other tests, see 'conftest'):
+    $> python -m pytest -q
+"""
+
+import io
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+import funcs
+import parallel
+
+from main import csv_to_json, iter_records, iter_rows
+from registry import register, unregister
+from writer import write_json_array
+
+HEADER: str = "Nome,Notas{3,5}::sum+avg+max,Idades{2,4}::range,Pesos{2,4}::median,Turmas{2,4}::first\n"
+
+LINES: list[str] = [
+    "Ana,10,12,14,20,18,60.5,61.5,A,B\n",
+    "Rui,8,9,10,11,12,21,30,24,70,72,C,D\n",
+    "Inês,15,15,15,15,15,22,23,24,25,55,56,57,58,G,H,I\n",
+    "Bad,1,2\n",
+    "Eva,1.5,2.5,3.5,4.5,5,19,19,20,21,80,81,82,J,K\n"
+]
+
+
+def csv_range(values: str, delimiter: str):
+    return funcs.csv_max(values, delimiter) - funcs.csv_min(values, delimiter)
+
+
+def column_range(values) -> list:
+
+    if isinstance(values, list):
+        return [max(numbers) - min(numbers) for numbers in values]
+
+    np = funcs.load_numpy()
+
+    return (np.nanmax(values, axis=1) - np.nanmin(values, axis=1)).tolist()
+
+
+def csv_first(values: str, delimiter: str):
+    return values.split(delimiter)[0]
+
+
+@pytest.fixture
+def csv_file(tmp_path: Path) -> Path:
+
+    file_path: Path = tmp_path / "ragged.csv"
+    file_path.write_text(HEADER + "".join(LINES))
+
+    return file_path
+
+
+@pytest.fixture(autouse=True)
+def custom_functions():
+
+    register("range", csv_range, column_range)
+    register("first", csv_first)
+
+    yield
+
+    unregister("range")
+    unregister("first")
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch) -> str:
+
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(funcs, "load_numpy", lambda: None)
+
+    return request.param
+
+
+def test_batch_and_field_paths_agree(csv_file: Path, backend: str):
+
+    records: list[dict] = list(iter_records(csv_file))
+
+    assert csv_to_json(csv_file) == records
+    assert len(records) == 4
+
+    assert records[0]["Notas{3,5}::sum+avg+max"] == {"sum": 36.0, "avg": 12.0, "max": 14.0}
+    assert records[1]["Idades{2,4}::range"] == 9.0
+    assert records[2]["Pesos{2,4}::median"] == 56.5
+    assert records[3]["Turmas{2,4}::first"] == "J"
+
+
+def test_compact_layout_agrees(csv_file: Path, backend: str):
+
+    rows: list = list(iter_rows(csv_file))
+
+    assert csv_to_json(csv_file, compact=True) == {"columns": rows[0], "rows": rows[1:]}
+
+
+def test_unknown_function_raises(tmp_path: Path):
+
+    file_path: Path = tmp_path / "unknown.csv"
+    file_path.write_text("Nome,Notas{2,4}::spread\nAna,1,2,3\n")
+
+    with pytest.raises(Exception, match="Unknown function: spread"):
+        list(iter_records(file_path))
+
+    with pytest.raises(Exception, match="Unknown function: spread"):
+        csv_to_json(file_path)
+
+
+def test_spawned_workers_see_registered_functions(csv_file: Path, monkeypatch):
+
+    spawn = multiprocessing.get_context("spawn")
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", partial(ProcessPoolExecutor, mp_context=spawn))
+
+    converted, expected = io.StringIO(), io.StringIO()
+
+    parallel.convert_parallel(csv_file, converted, workers=2)
+    write_json_array(iter_records(csv_file), expected)
+
+    assert converted.getvalue() == expected.getvalue()
@@ -0,0 +1,85 @@
+import json
+
+from typing import Iterable, TextIO
+
+
+def write_json_lines(records: Iterable, output: TextIO) -> int:
+    """
+    Writes every record as a JSON document on its own line (JSON Lines), as soon as it is produced.
+
+    :param records: Iterable (usually a generator) over the records.
+    :param output: Open text file (or sys.stdout) to write into.
+    :return: Amount of records written.
+    """
+
+    written: int = 0
+
+    for record in records:
+        output.write(json.dumps(record, ensure_ascii=False))
+        output.write("\n")
+        written += 1
+
+    return written
+
+
+def write_json_array(records: Iterable, output: TextIO) -> int:
+    """
+    Writes the records as a single JSON array, one element at a time, so the array is never held in memory.
+
+    :param records: Iterable (usually a generator) over the records.
+    :param output: Open text file (or sys.stdout) to write into.
+    :return: Amount of records written.
+    """
+
+    written: int = __write_elements__(records, output)
+    output.write("\n")
+
+    return written
+
+
+def write_compact(rows: Iterable, output: TextIO) -> int:
+    """
+    Writes the columns once and then the fields of every line as a list, one line at a time:
+
+        {"columns": ["Número", "Nome"],
+         "rows": [
+        ["A1", "Ana"],
+        ["A2", "Rui"]
+        ]}
+
+    :param rows: Iterable whose first item is the list of columns and the others the fields of each line
+    (see 'main.iter_rows').
+    :param output: Open text file (or sys.stdout) to write into.
+    :return: Amount of rows written.
+    """
+
+    rows = iter(rows)
+
+    output.write('{"columns": ' + json.dumps(next(rows), ensure_ascii=False) + ',\n "rows": ')
+    written: int = __write_elements__(rows, output)
+    output.write("}\n")
+
+    return written
+
+
+def __write_elements__(elements: Iterable, output: TextIO) -> int:
+
+    written: int = 0
+
+    output.write("[")
+
+    for element in elements:
+        output.write(",\n" if written else "\n")
+        output.write(json.dumps(element, ensure_ascii=False))
+        written += 1
+
+    output.write("\n]" if written else "]")
+
+    return written
+
+
+WRITERS = {
+    "array": write_json_array,
+    "jsonl": write_json_lines,
+    "compact": write_compact
+}